@@ -0,0 +1,13 @@
+import importlib
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_log_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Write settlement run logs under ``tmp_path`` instead of the repo."""
+    log_dir = tmp_path / "logs"
+    settle_person_module = importlib.import_module("wage.settle_person")
+    monkeypatch.setattr(settle_person_module, "LOG_DIR", log_dir)
+    return log_dir
@@ -0,0 +1,22 @@
+"""Shared CSV fixture writers for the test suite."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable, Sequence
+
+
+def write_csv(
+    path: Path, headers: Sequence[str], rows: Iterable[Sequence[str]] = ()
+) -> None:
+    """Write a comma-joined UTF-8 CSV fixture with a single write call."""
+    lines = [",".join(headers)]
+    lines.extend(",".join(row) for row in rows)
+    path.write_bytes(("\n".join(lines) + "\n").encode("utf-8"))
+
+
+def write_csvs(
+    specs: Iterable[tuple[Path, Sequence[str], Iterable[Sequence[str]]]],
+) -> None:
+    """Write several CSV fixtures given as ``(path, headers, rows)`` triples."""
+    for path, headers, rows in specs:
+        write_csv(path, headers, rows)
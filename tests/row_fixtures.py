@@ -0,0 +1,12 @@
+"""Shared in-memory row fixtures for the test suite."""
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import Mapping
+
+Rows = tuple[Mapping[str, str], ...]
+
+
+def freeze_rows(rows: list[dict[str, str]]) -> Rows:
+    """Return read-only rows so module-scoped fixtures can be shared safely."""
+    return tuple(MappingProxyType(row) for row in rows)
@@ -1,26 +1,22 @@
 import csv
 from pathlib import Path
 
+from tests.csv_fixtures import write_csv
 from wage.attendance_pipe import collect_attendance_people, compute_attendance
 from wage.payment_pipe import compute_payments
 from wage.settle_person import settle_person
 
 
-def _write_csv(path: Path, headers: list[str], rows: list[list[str]]) -> None:
-    with path.open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.writer(handle)
-        writer.writerow(headers)
-        writer.writerows(rows)
-
-
 def _read_csv(path: Path) -> list[dict[str, str]]:
     with path.open("r", encoding="utf-8", newline="") as handle:
-        return list(csv.DictReader(handle))
+        reader = csv.reader(handle)
+        headers = next(reader, [])
+        return [dict(zip(headers, row)) for row in reader]
 
 
 def test_attendance_expands_multiple_people(tmp_path: Path) -> None:
     attendance_path = tmp_path / "attendance.csv"
-    _write_csv(
+    write_csv(
         attendance_path,
         ["施工日期", "项目", "是否施工", "实际出勤人员", "出勤模式（填表用）"],
         [["2026-01-02", "测试项目", "是", "张三、李四", "全组"]],
@@ -38,12 +34,12 @@ def test_attendance_expands_multiple_people(tmp_path: Path) -> None:
 def test_attendance_mode_without_vehicle_field(tmp_path: Path) -> None:
     attendance_path = tmp_path / "attendance.csv"
     payment_path = tmp_path / "payment.csv"
-    _write_csv(
+    write_csv(
         attendance_path,
         ["施工日期", "项目", "是否施工", "实际出勤人员", "出勤模式（填表用）"],
         [["2026-01-03", "测试项目", "是", "张三", "单防撞"]],
     )
-    _write_csv(
+    write_csv(
         payment_path,
         ["项目", "报销人员", "报销日期", "报销类型", "报销金额", "上传凭证", "报销状态"],
         [["测试项目", "张三", "2026-01-04", "工资", "100", "V101", "已支付"]],
@@ -65,7 +61,7 @@ def test_attendance_mode_without_vehicle_field(tmp_path: Path) -> None:
 
 def test_payment_wage_only_new_headers(tmp_path: Path) -> None:
     payment_path = tmp_path / "payment.csv"
-    _write_csv(
+    write_csv(
         payment_path,
         ["项目", "报销人员", "报销日期", "报销类型", "报销金额", "上传凭证", "报销说明", "报销状态"],
         [
@@ -86,7 +82,7 @@ def test_payment_wage_only_new_headers(tmp_path: Path) -> None:
 
 def test_attendance_roster_fallback_and_work_values(tmp_path: Path) -> None:
     attendance_path = tmp_path / "attendance.csv"
-    _write_csv(
+    write_csv(
         attendance_path,
         [
             "施工日期",
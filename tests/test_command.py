@@ -1,4 +1,8 @@
-from wage.command import parse_command
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from wage.command import Command, parse_command
 
 
 def test_parse_command_minimal() -> None:
@@ -8,3 +12,15 @@ def test_parse_command_minimal() -> None:
     assert command["role"] == "组长"
     assert command["project_ended"] is True
     assert command["project_name"] == "测试项目"
+
+
+def test_parse_command_returns_frozen_command() -> None:
+    command = parse_command("工资：王怀宇 组长 项目已结束=是 项目=测试项目")
+
+    assert isinstance(command, Command)
+    assert command.person_name == command["person_name"] == "王怀宇"
+    assert command.get("missing", "默认") == "默认"
+    with pytest.raises(KeyError):
+        command["missing"]
+    with pytest.raises(FrozenInstanceError):
+        command.project_name = "其他项目"
@@ -211,3 +211,16 @@ def test_passphrase_project_auto_ignore_payment_multiple_when_attendance_unique(
     assert not errors
     people = _parse_people(lines)
     assert people["王怀宇"]["project_name"] == "项目A"
+
+
+def test_passphrase_road_conflicts_listed_in_input_order() -> None:
+    command_text = "\n".join(
+        [
+            "项目已结束=是",
+            "路补=无：赵五、李四、张三",
+            "路补=有：张三、李四、赵五",
+        ]
+    )
+    _, _, errors = expand_wage_passphrase_commands(command_text)
+
+    assert errors == ["路补名单冲突：张三/张三、李四/李四、赵五/赵五"]
@@ -0,0 +1,68 @@
+from pathlib import Path
+
+from tools import _csv_io
+
+
+def test_read_headers_only_first_record(tmp_path: Path) -> None:
+    crlf = tmp_path / "crlf.csv"
+    crlf.write_bytes("\ufeff施工日期,是否施工\r\n2026-01-01,是\r\n".encode("utf-8"))
+    quoted = tmp_path / "quoted.csv"
+    quoted.write_bytes('"施工\n日期",是否施工\n2026-01-01,是\n'.encode("utf-8"))
+    quoted_crlf = tmp_path / "quoted_crlf.csv"
+    quoted_crlf.write_bytes('"施工\r\n日期",是否施工\r\n2026-01-01,是\r\n'.encode("utf-8"))
+
+    assert _csv_io.read_headers(crlf) == ["施工日期", "是否施工"]
+    assert _csv_io.read_headers(quoted) == ["施工\n日期", "是否施工"]
+    assert _csv_io.read_headers(quoted_crlf) == ["施工\r\n日期", "是否施工"]
+
+
+def test_clean_header_normalizes_width_and_spaces() -> None:
+    assert _csv_io.clean_header("\ufeff 出勤模式（填表用）\u3000 备注\t") == (
+        "出勤模式(填表用) 备注"
+    )
+
+
+def test_clean_header_interns_results() -> None:
+    first = _csv_io.clean_header("施工日期 ")
+    _csv_io.clean_header.cache_clear()
+
+    assert _csv_io.clean_header(" 施工日期") is first
+
+
+def test_count_keywords_matches_within_single_headers() -> None:
+    keywords = frozenset({"施工日期", "日期", "是否施工"})
+    count = _csv_io.count_keywords
+    join = _csv_io.join_headers
+
+    assert count(join(["施工", "日期"]), keywords) == 1
+    assert count(join(["施工日期(填)", "是否施工"]), keywords) == 3
+
+
+def test_iter_csvs_walks_like_rglob(tmp_path: Path) -> None:
+    for name in ["a.csv", "sub/b.csv", "sub/deeper/c.csv", "sub/notes.txt", "d.csv/e.csv"]:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("日期\n", encoding="utf-8")
+
+    found = [path for path, _ in _csv_io.iter_csvs(tmp_path)]
+
+    assert sorted(found) == sorted(
+        path for path in tmp_path.rglob("*.csv") if path.is_file()
+    )
+    assert found.index(tmp_path / "sub" / "b.csv") < found.index(
+        tmp_path / "sub" / "deeper" / "c.csv"
+    )
+
+
+def test_read_headers_treats_binary_as_headerless(tmp_path: Path) -> None:
+    binary = tmp_path / "export.csv"
+    binary.write_bytes(b"PK\x03\x04\x00\x00" + bytes(range(256)) * 64)
+
+    assert _csv_io.read_headers(binary) == []
+
+
+def test_scan_map_keeps_order_across_threads() -> None:
+    items = list(range(_csv_io.SCAN_THREAD_MIN_FILES * 4))
+
+    assert _csv_io.scan_map(str, items) == [str(item) for item in items]
+    assert _csv_io.scan_map(str, items[:1]) == ["0"]
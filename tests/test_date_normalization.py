@@ -0,0 +1,33 @@
+import pytest
+
+from wage.attendance_pipe import _parse_date
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("2026-01-02", ("2026-01-02", None)),
+        ("2026/1/2", ("2026-01-02", "2026/1/2")),
+        ("2026.01.02", ("2026-01-02", "2026.01.02")),
+        ("2026年1月2日", ("2026-01-02", "2026年1月2日")),
+        ("2026年01月02", ("2026-01-02", "2026年01月02")),
+        ("20260102", ("2026-01-02", "20260102")),
+        ("2024-02-29", ("2024-02-29", None)),
+        ("0999-01-01", ("999-01-01", "0999-01-01")),
+        (" 2026-1-2 ", ("2026-01-02", "2026-1-2")),
+        ("2026--01--02", ("2026-01-02", "2026--01--02")),
+        ("-2026-01-02-", ("2026-01-02", "-2026-01-02-")),
+        (
+            "\uff12\uff10\uff12\uff16-01-02",
+            ("2026-01-02", "\uff12\uff10\uff12\uff16-01-02"),
+        ),
+        ("", (None, None)),
+        ("abc", (None, "abc")),
+        ("2026-13-01", (None, "2026-13-01")),
+        ("2026-02-30", (None, "2026-02-30")),
+        ("2023-02-29", (None, "2023-02-29")),
+        ("2026-1-02 08:00", (None, "2026-1-02 08:00")),
+    ],
+)
+def test_parse_date_normalizes_to_iso(value: str, expected: tuple) -> None:
+    assert _parse_date(value) == expected
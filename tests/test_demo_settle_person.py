@@ -1,11 +1,8 @@
 from pathlib import Path
 
+from tests.csv_fixtures import write_csv, write_csvs
 from tools import demo_settle_person
-
-
-def _write_csv(path: Path, headers: list[str]) -> None:
-    content = ",".join(headers)
-    path.write_text(f"{content}\n", encoding="utf-8")
+from tools._csv_io import join_headers
 
 
 def test_current_dir_empty(tmp_path: Path, capsys: object) -> None:
@@ -25,7 +22,7 @@ def test_current_dir_single_combined(tmp_path: Path) -> None:
     current_dir = data_dir / "当前"
     current_dir.mkdir(parents=True)
     combined = current_dir / "combined.csv"
-    _write_csv(combined, ["施工日期", "是否施工", "报销日期", "报销金额", "报销类型"])
+    write_csv(combined, ["施工日期", "是否施工", "报销日期", "报销金额", "报销类型"])
 
     selected = demo_settle_person._resolve_input_paths(data_dir)
 
@@ -37,7 +34,7 @@ def test_current_dir_single_non_combined(tmp_path: Path, capsys: object) -> None
     current_dir = data_dir / "当前"
     current_dir.mkdir(parents=True)
     attendance = current_dir / "attendance.csv"
-    _write_csv(attendance, ["施工日期", "是否施工", "施工人员"])
+    write_csv(attendance, ["施工日期", "是否施工", "施工人员"])
 
     selected = demo_settle_person._resolve_input_paths(data_dir)
 
@@ -52,8 +49,8 @@ def test_current_dir_two_csvs(tmp_path: Path) -> None:
     current_dir.mkdir(parents=True)
     attendance = current_dir / "attendance_any.csv"
     payment = current_dir / "payment_any.csv"
-    _write_csv(attendance, ["施工日期", "是否施工", "施工人员"])
-    _write_csv(payment, ["报销日期", "报销金额", "报销状态"])
+    write_csv(attendance, ["施工日期", "是否施工", "施工人员"])
+    write_csv(payment, ["报销日期", "报销金额", "报销状态"])
 
     selected = demo_settle_person._resolve_input_paths(data_dir)
 
@@ -67,9 +64,13 @@ def test_current_dir_multiple_attendance_blocks(tmp_path: Path, capsys: object)
     attendance_a = current_dir / "施工A.csv"
     attendance_b = current_dir / "施工B.csv"
     payment = current_dir / "报销.csv"
-    _write_csv(attendance_a, ["施工日期", "是否施工", "施工人员"])
-    _write_csv(attendance_b, ["工作日期", "是否施工", "姓名"])
-    _write_csv(payment, ["报销日期", "报销金额", "报销状态"])
+    write_csvs(
+        [
+            (attendance_a, ["施工日期", "是否施工", "施工人员"], []),
+            (attendance_b, ["工作日期", "是否施工", "姓名"], []),
+            (payment, ["报销日期", "报销金额", "报销状态"], []),
+        ]
+    )
 
     selected = demo_settle_person._resolve_input_paths(data_dir)
 
@@ -83,7 +84,7 @@ def test_archive_ignored_when_fallback(tmp_path: Path, capsys: object) -> None:
     data_dir = tmp_path / "data"
     archive_dir = data_dir / "归档"
     archive_dir.mkdir(parents=True)
-    _write_csv(archive_dir / "archived.csv", ["施工日期", "报销日期"])
+    write_csv(archive_dir / "archived.csv", ["施工日期", "报销日期"])
 
     selected = demo_settle_person._resolve_input_paths(data_dir)
 
@@ -93,15 +94,15 @@ def test_archive_ignored_when_fallback(tmp_path: Path, capsys: object) -> None:
 
 
 def test_selects_combined_csv(tmp_path: Path) -> None:
-    data_dir = tmp_path / "data"
-    data_dir.mkdir()
-    combined = data_dir / "combined.csv"
-    _write_csv(
-        combined,
-        ["施工日期", "是否施工", "报销日期", "报销金额", "报销类型"],
-    )
+    combined = tmp_path / "combined.csv"
+    candidates = [
+        demo_settle_person._build_candidate(
+            combined,
+            ["施工日期", "是否施工", "报销日期", "报销金额", "报销类型"],
+            0.0,
+        )
+    ]
 
-    candidates = demo_settle_person._scan_csv_candidates(data_dir)
     selected = demo_settle_person._select_input_paths(candidates)
 
     assert selected is not None
@@ -110,14 +111,17 @@ def test_selects_combined_csv(tmp_path: Path) -> None:
 
 
 def test_selects_separate_csvs(tmp_path: Path) -> None:
-    data_dir = tmp_path / "data"
-    data_dir.mkdir()
-    attendance = data_dir / "attendance_any.csv"
-    payment = data_dir / "payment_any.csv"
-    _write_csv(attendance, ["施工日期", "是否施工", "施工人员"])
-    _write_csv(payment, ["报销日期", "报销金额", "报销状态"])
+    attendance = tmp_path / "attendance_any.csv"
+    payment = tmp_path / "payment_any.csv"
+    candidates = [
+        demo_settle_person._build_candidate(
+            attendance, ["施工日期", "是否施工", "施工人员"], 0.0
+        ),
+        demo_settle_person._build_candidate(
+            payment, ["报销日期", "报销金额", "报销状态"], 0.0
+        ),
+    ]
 
-    candidates = demo_settle_person._scan_csv_candidates(data_dir)
     selected = demo_settle_person._select_input_paths(candidates)
 
     assert selected is not None
@@ -164,8 +168,8 @@ def test_recursive_current_dir_selection(tmp_path: Path) -> None:
     current_dir.mkdir(parents=True)
     attendance = current_dir / "施工表_随机名.csv"
     payment = current_dir / "报销表_随机名.csv"
-    _write_csv(attendance, ["施工日期", "是否施工", "施工人员", "项目名称"])
-    _write_csv(payment, ["报销日期", "报销金额", "报销状态", "报销类型"])
+    write_csv(attendance, ["施工日期", "是否施工", "施工人员", "项目名称"])
+    write_csv(payment, ["报销日期", "报销金额", "报销状态", "报销类型"])
 
     selected = demo_settle_person._resolve_input_paths(data_dir)
 
@@ -177,7 +181,7 @@ def test_single_combined_in_subdir(tmp_path: Path) -> None:
     current_dir = data_dir / "当前" / "上传"
     current_dir.mkdir(parents=True)
     combined = current_dir / "合并表.csv"
-    _write_csv(combined, ["施工日期", "是否施工", "报销日期", "报销金额", "报销类型"])
+    write_csv(combined, ["施工日期", "是否施工", "报销日期", "报销金额", "报销类型"])
 
     selected = demo_settle_person._resolve_input_paths(data_dir)
 
@@ -202,3 +206,65 @@ def test_read_command_file_loads(tmp_path: Path) -> None:
     result = demo_settle_person._read_command_file(command_path)
 
     assert "工资" in result
+
+
+def test_read_command_file_drops_bom(tmp_path: Path) -> None:
+    command_path = tmp_path / "口令.txt"
+    command_path.write_bytes("\ufeff工资：王怀宇 组长\n".encode("utf-8"))
+
+    assert demo_settle_person._read_command_file(command_path) == "工资：王怀宇 组长"
+
+
+def test_read_input_rows_parses_combined_table_once(tmp_path: Path) -> None:
+    combined = tmp_path / "combined.csv"
+    write_csv(combined, ["施工日期", "报销金额"], [["2026-01-01", "100"]])
+    other = tmp_path / "payment.csv"
+    write_csv(other, ["报销金额"], [["50"]])
+
+    attendance_rows, payment_rows = demo_settle_person._read_input_rows(
+        (combined, combined)
+    )
+    assert payment_rows is attendance_rows
+    assert attendance_rows[0]["报销金额"] == "100"
+
+    attendance_rows, payment_rows = demo_settle_person._read_input_rows(
+        (combined, other)
+    )
+    assert payment_rows[0]["报销金额"] == "50"
+
+
+def test_read_runtime_overrides_parses_known_keys(tmp_path: Path) -> None:
+    config_path = tmp_path / "配置.txt"
+    config_path.write_text(
+        "# verbose=9\r\nverbose = 1\r\n显示说明\r\nshow_audit:0\r\nunknown=3\r\n",
+        encoding="utf-8",
+    )
+
+    assert demo_settle_person._read_runtime_overrides(config_path) == {
+        "verbose": 1,
+        "show_audit": 0,
+    }
+    assert demo_settle_person._read_runtime_overrides(tmp_path / "missing.txt") == {}
+
+
+def test_first_matching_header_prefers_first_containing_header() -> None:
+    headers = ["施工日期", "日期", "报销人员"]
+    header_map = {header: f"raw:{header}" for header in headers}
+    blob = join_headers(headers)
+
+    match = demo_settle_person._first_matching_header
+    assert match(headers, header_map, ("日期",), blob) == "raw:施工日期"
+    assert match(headers, header_map, ("姓名", "人员"), blob) == "raw:报销人员"
+    assert match(headers, header_map, ("车辆",), blob) is None
+    assert match([], {}, ("日期",), "") is None
+
+
+def test_format_relative_path_matches_relative_to(tmp_path: Path) -> None:
+    inside = tmp_path / "data" / "当前" / "出勤.csv"
+
+    assert demo_settle_person._format_relative_path(inside, tmp_path) == str(
+        inside.relative_to(tmp_path)
+    )
+    assert demo_settle_person._format_relative_path(tmp_path, tmp_path) == "."
+    outside = tmp_path.parent / f"{tmp_path.name}x" / "出勤.csv"
+    assert demo_settle_person._format_relative_path(outside, tmp_path) == str(outside)
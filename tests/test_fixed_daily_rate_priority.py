@@ -1,3 +1,4 @@
+import os
 from decimal import Decimal
 from pathlib import Path
 
@@ -68,7 +69,11 @@ def test_fixed_daily_rate_priority(tmp_path: Path) -> None:
         runtime_overrides={"attendance_source": "a.csv", "payment_source": "b.csv"},
     )
 
-    summary = summary_path.read_text(encoding="utf-8")
+    # The default writer emits UTF-8 with platform line endings throughout.
+    raw_summary = summary_path.read_bytes().decode("utf-8")
+    assert raw_summary.count("\n") == raw_summary.count(os.linesep) > 0
+    summary = raw_summary.replace(os.linesep, "\n")
+    assert summary == summary_path.read_text(encoding="utf-8")
     assert "固定日薪命中：" in summary
     assert "王怀宇=280（来源：口令）" in summary
     assert "余步云=260（来源：系统）" in summary
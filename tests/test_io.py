@@ -0,0 +1,159 @@
+import csv
+import sys
+from itertools import chain
+from pathlib import Path
+
+import pytest
+
+from wage.attendance_pipe import compute_attendance
+from wage.io import collect_headers, iter_rows, read_rows
+
+
+def _write_csv(path: Path, lines: list[str]) -> None:
+    path.write_text("\ufeff" + "\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_iter_rows_yields_bounded_chunks(tmp_path: Path) -> None:
+    path = tmp_path / "attendance.csv"
+    _write_csv(
+        path,
+        [
+            "日期,姓名,是否施工",
+            "2025-11-01,张三,是",
+            "2025-11-02,张三,否",
+            "",
+            "2025-11-03,李四",
+        ],
+    )
+
+    chunks = list(iter_rows(path, chunksize=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert chunks[0][0] == {"日期": "2025-11-01", "姓名": "张三", "是否施工": "是"}
+    assert chunks[1][0] == {"日期": "2025-11-03", "姓名": "李四", "是否施工": ""}
+    assert list(chain.from_iterable(chunks)) == read_rows(path)
+
+
+def test_iter_rows_rejects_non_positive_chunksize(tmp_path: Path) -> None:
+    path = tmp_path / "empty.csv"
+    _write_csv(path, ["日期"])
+
+    with pytest.raises(ValueError):
+        next(iter_rows(path, chunksize=0))
+
+
+def test_chunked_rows_match_full_read(tmp_path: Path) -> None:
+    path = tmp_path / "attendance.csv"
+    _write_csv(
+        path,
+        [
+            "日期,姓名,是否施工,车辆",
+            "2025-11-01,张三,是,防撞车",
+            "2025-11-01,李四,是,防撞车",
+            "2025-11-02,张三,否,防撞车",
+        ],
+    )
+
+    full = compute_attendance(read_rows(path), None, "张三")
+    chunked = compute_attendance(
+        chain.from_iterable(iter_rows(path, chunksize=1)), None, "张三"
+    )
+
+    assert chunked == full
+    assert full.date_sets["单防撞｜出勤"] == ["2025-11-01"]
+
+
+def test_read_rows_shares_repeated_cells(tmp_path: Path) -> None:
+    path = tmp_path / "payment.csv"
+    _write_csv(
+        path,
+        [
+            "项目,报销状态",
+            "测试项目,已支付",
+            "测试项目,已支付",
+        ],
+    )
+
+    first, second = read_rows(path)
+
+    assert first == second
+    assert first["项目"] is second["项目"]
+    assert first["报销状态"] is second["报销状态"]
+
+
+def test_compact_rows_settle_like_dict_rows(tmp_path: Path) -> None:
+    path = tmp_path / "attendance.csv"
+    _write_csv(
+        path,
+        [
+            "日期,姓名,是否施工,车辆",
+            "2025-11-01,张三,是,防撞车",
+            "2025-11-02,张三,否",
+        ],
+    )
+
+    rows = read_rows(path)
+    compact = read_rows(path, compact=True)
+
+    assert compact == rows
+    assert compact[1].get("车辆") == ""
+    assert compact[1].get("缺失", "-") == "-"
+    assert compute_attendance(compact, None, "张三") == compute_attendance(
+        rows, None, "张三"
+    )
+    with pytest.raises(TypeError):
+        compact[0]["姓名"] = "李四"  # type: ignore[index]
+
+
+def test_read_rows_pads_short_rows_and_drops_extra_cells(tmp_path: Path) -> None:
+    path = tmp_path / "attendance.csv"
+    _write_csv(
+        path,
+        [
+            "日期,姓名,是否施工,车辆",
+            "2025-11-01,张三,是",
+            "2025-11-02,张三,否,防撞车,多余",
+        ],
+    )
+    filled = [
+        {"日期": "2025-11-01", "姓名": "张三", "是否施工": "是", "车辆": ""},
+        {"日期": "2025-11-02", "姓名": "张三", "是否施工": "否", "车辆": "防撞车"},
+    ]
+    with path.open("r", encoding="utf-8-sig", newline="") as handle:
+        dict_reader_rows = list(csv.DictReader(handle))
+
+    # csv.DictReader would give None (and a None key), which the pipes cannot strip.
+    assert dict_reader_rows[0]["车辆"] is None
+    assert dict_reader_rows[1][None] == ["多余"]  # type: ignore[index]
+    assert read_rows(path) == filled
+    assert read_rows(path, compact=True) == filled
+    assert compute_attendance(read_rows(path), None, "张三") == compute_attendance(
+        filled, None, "张三"
+    )
+
+
+def test_read_rows_interns_header_keys(tmp_path: Path) -> None:
+    path = tmp_path / "payment.csv"
+    _write_csv(path, ["报销日期,报销状态", "2025-11-01,已支付"])
+
+    (row,) = read_rows(path)
+    (compact,) = read_rows(path, compact=True)
+
+    for key in (*row, *compact):
+        assert key is sys.intern(key)
+
+
+def test_collect_headers_covers_rows_with_differing_keys(tmp_path: Path) -> None:
+    path = tmp_path / "attendance.csv"
+    _write_csv(path, ["日期, 姓名 ,是否施工", "2025-11-01,张三,是", "2025-11-02,李四,否"])
+    rows = [
+        {"日期": "2025-11-01", "姓名": "张三"},
+        {"日期": "2025-11-02", "姓名": "李四"},
+        {"日期": "2025-11-03", " 车辆 ": "防撞车"},
+        {"日期": "2025-11-04", "姓名": "王五"},
+        {"项目": "测试项目"},
+    ]
+
+    assert collect_headers(rows) == {"日期", "姓名", "车辆", "项目"}
+    assert collect_headers(read_rows(path, compact=True)) == {"日期", "姓名", "是否施工"}
+    assert collect_headers([]) == set()
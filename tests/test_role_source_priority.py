@@ -38,7 +38,7 @@ def _payment_rows(project: str) -> list[dict[str, str]]:
     ]
 
 
-def test_role_source_priority(tmp_path: Path) -> None:
+def test_role_source_priority() -> None:
     project = "测试项目"
     command_text = "\n".join(
         [
@@ -49,19 +49,19 @@ def test_role_source_priority(tmp_path: Path) -> None:
         ]
     )
     command = parse_command(command_text)
-    output_dir = tmp_path / "输出"
-    output_dir.mkdir()
+    sink: dict[str, str] = {}
 
-    summary_path = demo_settle_project.settle_project(
+    demo_settle_project.settle_project(
         _attendance_rows(project),
         _payment_rows(project),
         command=command,
         project_name=project,
-        output_dir=output_dir,
+        output_dir=Path("输出"),
         runtime_overrides={"attendance_source": "a.csv", "payment_source": "b.csv"},
+        writer=lambda path, text: sink.__setitem__(path.name, text),
     )
 
-    summary = summary_path.read_text(encoding="utf-8")
+    summary = sink["汇总索引.txt"]
     assert "角色来源：" in summary
     assert "李四=组长（来源：表）" in summary
     assert "张三=组长（来源：口令）" in summary
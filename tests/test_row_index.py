@@ -0,0 +1,45 @@
+import pytest
+
+from wage.attendance_pipe import build_attendance_index, compute_attendance
+from wage.payment_pipe import build_payment_index, compute_payments
+
+
+def _attendance_rows() -> list[dict[str, str]]:
+    return [
+        {"施工日期": "2026-01-02", "项目": "测试项目", "是否施工": "是", "实际出勤人员": "张三、李四"},
+        {"施工日期": "2026-01-03", "项目": "测试项目", "是否施工": "否", "实际出勤人员": "张三(组长)"},
+        {"施工日期": "2026-01-03", "项目": "其他项目", "是否施工": "是", "实际出勤人员": "李四"},
+    ]
+
+
+def _payment_rows() -> list[dict[str, str]]:
+    base = {"项目": "测试项目", "报销类型": "工资", "报销状态": "已支付"}
+    return [
+        {**base, "报销人员": "李四(外协)", "报销日期": "2026-01-04", "报销金额": "80", "上传凭证": "V1"},
+        {**base, "报销人员": "张三", "报销日期": "2026-01-05", "报销金额": "100", "上传凭证": "V2"},
+        {**base, "报销人员": "王五(临时)", "报销日期": "2026-01-06", "报销金额": "90", "上传凭证": "V3"},
+        {**base, "报销人员": "张三", "报销日期": "2026-01-07", "报销金额": "abc", "上传凭证": "V4", "项目": "其他项目"},
+    ]
+
+
+@pytest.mark.parametrize("person", ["张三", "李四", "王五", None])
+def test_shared_indexes_match_full_scan(person: str | None) -> None:
+    attendance_rows = _attendance_rows()
+    payment_rows = _payment_rows()
+    attendance_index = build_attendance_index(attendance_rows, "测试项目")
+    payment_index = build_payment_index(payment_rows)
+
+    assert compute_attendance(
+        attendance_rows, "测试项目", person, attendance_index
+    ) == compute_attendance(attendance_rows, "测试项目", person)
+    assert compute_payments(
+        payment_rows, "测试项目", person, None, payment_index
+    ) == compute_payments(payment_rows, "测试项目", person)
+
+
+def test_attendance_index_rejects_other_project() -> None:
+    rows = _attendance_rows()
+    index = build_attendance_index(rows, "测试项目")
+
+    with pytest.raises(ValueError):
+        compute_attendance(rows, "其他项目", "张三", index)
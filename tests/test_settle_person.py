@@ -1,68 +1,96 @@
+import importlib
+import json
 import re
+from pathlib import Path
 
+import pytest
+
+from tests.row_fixtures import Rows, freeze_rows
+from wage.attendance_pipe import build_attendance_index
 from wage.ruleset import get_ruleset_version
-from wage.settle_person import settle_person
-
-
-def _attendance_rows() -> list[dict[str, str]]:
-    return [
-        {"日期": "2025-11-01", "姓名": "王怀宇", "是否施工": "是", "车辆": "防撞车"},
-        {"日期": "2025-11-01", "姓名": "张三", "是否施工": "是", "车辆": "防撞车"},
-        {"日期": "2025-11-02", "姓名": "王怀宇", "是否施工": "否", "车辆": "防撞车"},
-        {"日期": "2025-11-02", "姓名": "张三", "是否施工": "是", "车辆": "防撞车"},
-        {"日期": "2025-11-02", "姓名": "李四", "是否施工": "是", "车辆": "防撞车"},
-        {"日期": "2025-11-02", "姓名": "赵五", "是否施工": "是", "车辆": "防撞车"},
-        {"日期": "2025-11-03", "姓名": "王怀宇", "是否施工": "是", "车辆": "防撞车"},
-        {"日期": "2025-11-03", "姓名": "张三", "是否施工": "是", "车辆": "防撞车"},
-        {"日期": "2025-11-03", "姓名": "李四", "是否施工": "是", "车辆": "防撞车"},
-    ]
+from wage.settle_person import settle_people, settle_people_results, settle_person
+
+# wage re-exports the settle_person function under the module's own name.
+settle_person_module = importlib.import_module("wage.settle_person")
+
+
+def _strip_run_ids(outputs: list[str]) -> list[str]:
+    return [re.sub(r"[0-9a-f]{12}", "<run_id>", text) for text in outputs]
+
+
+@pytest.fixture(scope="module")
+def attendance_rows() -> Rows:
+    return freeze_rows(
+        [
+            {"日期": "2025-11-01", "姓名": "王怀宇", "是否施工": "是", "车辆": "防撞车"},
+            {"日期": "2025-11-01", "姓名": "张三", "是否施工": "是", "车辆": "防撞车"},
+            {"日期": "2025-11-02", "姓名": "王怀宇", "是否施工": "否", "车辆": "防撞车"},
+            {"日期": "2025-11-02", "姓名": "张三", "是否施工": "是", "车辆": "防撞车"},
+            {"日期": "2025-11-02", "姓名": "李四", "是否施工": "是", "车辆": "防撞车"},
+            {"日期": "2025-11-02", "姓名": "赵五", "是否施工": "是", "车辆": "防撞车"},
+            {"日期": "2025-11-03", "姓名": "王怀宇", "是否施工": "是", "车辆": "防撞车"},
+            {"日期": "2025-11-03", "姓名": "张三", "是否施工": "是", "车辆": "防撞车"},
+            {"日期": "2025-11-03", "姓名": "李四", "是否施工": "是", "车辆": "防撞车"},
+        ]
+    )
 
 
-def _payment_rows() -> list[dict[str, str]]:
-    return [
-        {
-            "报销日期": "2025-11-04",
-            "报销金额": "300",
-            "报销状态": "已支付",
-            "报销类型": "工资",
-            "报销人员": "王怀宇",
-            "项目": "测试项目",
-            "上传凭证": "V001",
-        }
-    ]
+@pytest.fixture(scope="module")
+def payment_rows() -> Rows:
+    return freeze_rows(
+        [
+            {
+                "报销日期": "2025-11-04",
+                "报销金额": "300",
+                "报销状态": "已支付",
+                "报销类型": "工资",
+                "报销人员": "王怀宇",
+                "项目": "测试项目",
+                "上传凭证": "V001",
+            }
+        ]
+    )
 
 
-def _attendance_rows_for_allowances() -> list[dict[str, str]]:
-    return [
-        {"日期": "2025-11-05", "姓名": "王怀宇", "是否施工": "是", "车辆": "防撞车"},
-        {"日期": "2025-11-05", "姓名": "张三", "是否施工": "是", "车辆": "防撞车"},
-        {"日期": "2025-11-05", "姓名": "李四", "是否施工": "是", "车辆": "防撞车"},
-        {"日期": "2025-11-06", "姓名": "王怀宇", "是否施工": "否", "车辆": "防撞车"},
-        {"日期": "2025-11-06", "姓名": "张三", "是否施工": "是", "车辆": "防撞车"},
-        {"日期": "2025-11-06", "姓名": "李四", "是否施工": "是", "车辆": "防撞车"},
-        {"日期": "2025-11-06", "姓名": "赵五", "是否施工": "是", "车辆": "防撞车"},
-    ]
+@pytest.fixture(scope="module")
+def allowance_attendance_rows() -> Rows:
+    return freeze_rows(
+        [
+            {"日期": "2025-11-05", "姓名": "王怀宇", "是否施工": "是", "车辆": "防撞车"},
+            {"日期": "2025-11-05", "姓名": "张三", "是否施工": "是", "车辆": "防撞车"},
+            {"日期": "2025-11-05", "姓名": "李四", "是否施工": "是", "车辆": "防撞车"},
+            {"日期": "2025-11-06", "姓名": "王怀宇", "是否施工": "否", "车辆": "防撞车"},
+            {"日期": "2025-11-06", "姓名": "张三", "是否施工": "是", "车辆": "防撞车"},
+            {"日期": "2025-11-06", "姓名": "李四", "是否施工": "是", "车辆": "防撞车"},
+            {"日期": "2025-11-06", "姓名": "赵五", "是否施工": "是", "车辆": "防撞车"},
+        ]
+    )
 
 
-def _payment_rows_for_allowances() -> list[dict[str, str]]:
-    return [
-        {
-            "报销日期": "2025-11-07",
-            "报销金额": "350",
-            "报销状态": "已支付",
-            "报销类型": "路补",
-            "报销人员": "王怀宇",
-            "项目": "测试项目",
-            "上传凭证": "V100",
-        }
-    ]
+@pytest.fixture(scope="module")
+def allowance_payment_rows() -> Rows:
+    return freeze_rows(
+        [
+            {
+                "报销日期": "2025-11-07",
+                "报销金额": "350",
+                "报销状态": "已支付",
+                "报销类型": "路补",
+                "报销人员": "王怀宇",
+                "项目": "测试项目",
+                "上传凭证": "V100",
+            }
+        ]
+    )
 
 
-def test_settle_person_outputs_two_segments() -> None:
+def test_settle_person_outputs_two_segments(
+    attendance_rows: Rows, payment_rows: Rows
+) -> None:
     version = get_ruleset_version()
     output = settle_person(
-        _attendance_rows(),
-        _payment_rows(),
+        attendance_rows,
+        payment_rows,
         person_name="王怀宇",
         role="组长",
         project_ended=True,
@@ -105,10 +133,12 @@ def test_settle_person_blocking_report() -> None:
     assert "【详细版（给杰对账）】" not in output
 
 
-def test_settle_person_allowances_enabled() -> None:
+def test_settle_person_allowances_enabled(
+    allowance_attendance_rows: Rows, allowance_payment_rows: Rows
+) -> None:
     output = settle_person(
-        _attendance_rows_for_allowances(),
-        _payment_rows_for_allowances(),
+        allowance_attendance_rows,
+        allowance_payment_rows,
         person_name="王怀宇",
         role="组长",
         project_ended=True,
@@ -120,7 +150,9 @@ def test_settle_person_allowances_enabled() -> None:
     assert "路补：200" in output
 
 
-def test_settle_person_no_road_allowance_when_missing() -> None:
+def test_settle_person_no_road_allowance_when_missing(
+    allowance_attendance_rows: Rows
+) -> None:
     payment_rows = [
         {
             "报销日期": "",
@@ -133,7 +165,7 @@ def test_settle_person_no_road_allowance_when_missing() -> None:
         }
     ]
     output = settle_person(
-        _attendance_rows_for_allowances(),
+        allowance_attendance_rows,
         payment_rows,
         person_name="王怀宇",
         role="组长",
@@ -145,7 +177,7 @@ def test_settle_person_no_road_allowance_when_missing() -> None:
     assert "路补：0" in output
 
 
-def test_settle_person_invalid_status_moves_to_pending() -> None:
+def test_settle_person_invalid_status_moves_to_pending(attendance_rows: Rows) -> None:
     payment_rows = [
         {
             "报销日期": "2025-11-04",
@@ -159,7 +191,7 @@ def test_settle_person_invalid_status_moves_to_pending() -> None:
         }
     ]
     output = settle_person(
-        _attendance_rows(),
+        attendance_rows,
         payment_rows,
         person_name="王怀宇",
         role="组长",
@@ -174,7 +206,7 @@ def test_settle_person_invalid_status_moves_to_pending() -> None:
     assert "待确认清单" not in output
 
 
-def test_settle_person_missing_status_moves_to_pending() -> None:
+def test_settle_person_missing_status_moves_to_pending(attendance_rows: Rows) -> None:
     payment_rows = [
         {
             "报销日期": "2025-11-04",
@@ -187,7 +219,7 @@ def test_settle_person_missing_status_moves_to_pending() -> None:
         }
     ]
     output = settle_person(
-        _attendance_rows(),
+        attendance_rows,
         payment_rows,
         person_name="王怀宇",
         role="组长",
@@ -202,7 +234,7 @@ def test_settle_person_missing_status_moves_to_pending() -> None:
     assert "待确认清单" not in output
 
 
-def test_settle_person_result_passed_moves_to_pending() -> None:
+def test_settle_person_result_passed_moves_to_pending(attendance_rows: Rows) -> None:
     payment_rows = [
         {
             "报销日期": "2025-11-04",
@@ -216,7 +248,7 @@ def test_settle_person_result_passed_moves_to_pending() -> None:
         }
     ]
     output = settle_person(
-        _attendance_rows(),
+        attendance_rows,
         payment_rows,
         person_name="王怀宇",
         role="组长",
@@ -231,7 +263,7 @@ def test_settle_person_result_passed_moves_to_pending() -> None:
     assert "待确认清单" not in output
 
 
-def test_settle_person_result_rejected_moves_to_pending() -> None:
+def test_settle_person_result_rejected_moves_to_pending(attendance_rows: Rows) -> None:
     payment_rows = [
         {
             "报销日期": "2025-11-04",
@@ -245,7 +277,7 @@ def test_settle_person_result_rejected_moves_to_pending() -> None:
         }
     ]
     output = settle_person(
-        _attendance_rows(),
+        attendance_rows,
         payment_rows,
         person_name="王怀宇",
         role="组长",
@@ -260,7 +292,7 @@ def test_settle_person_result_rejected_moves_to_pending() -> None:
     assert "待确认清单" not in output
 
 
-def test_settle_person_status_reimbursed_counts_as_paid() -> None:
+def test_settle_person_status_reimbursed_counts_as_paid(attendance_rows: Rows) -> None:
     payment_rows = [
         {
             "报销日期": "2025-11-04",
@@ -273,7 +305,7 @@ def test_settle_person_status_reimbursed_counts_as_paid() -> None:
         }
     ]
     output = settle_person(
-        _attendance_rows(),
+        attendance_rows,
         payment_rows,
         person_name="王怀宇",
         role="组长",
@@ -285,14 +317,14 @@ def test_settle_person_status_reimbursed_counts_as_paid() -> None:
     assert "已付合计：300｜预支合计：0" in output
 
 
-def test_settle_person_default_suppresses_cleaning_logs() -> None:
+def test_settle_person_default_suppresses_cleaning_logs(payment_rows: Rows) -> None:
     attendance_rows = [
         {"日期": "2025/11/01", "姓名": "王怀宇、张三", "是否施工": "是", "车辆": "防撞车"},
         {"日期": "2025/11/02", "姓名": "王怀宇", "是否施工": "否", "车辆": "防撞车"},
     ]
     output = settle_person(
         attendance_rows,
-        _payment_rows(),
+        payment_rows,
         person_name="王怀宇",
         role="组长",
         project_ended=True,
@@ -305,14 +337,16 @@ def test_settle_person_default_suppresses_cleaning_logs() -> None:
     assert "input_hash" not in output
 
 
-def test_settle_person_verbose_includes_audit_and_cleaning_logs() -> None:
+def test_settle_person_verbose_includes_audit_and_cleaning_logs(
+    payment_rows: Rows
+) -> None:
     attendance_rows = [
         {"日期": "2025/11/01", "姓名": "王怀宇、张三", "是否施工": "是", "车辆": "防撞车"},
         {"日期": "2025/11/02", "姓名": "王怀宇", "是否施工": "否", "车辆": "防撞车"},
     ]
     output = settle_person(
         attendance_rows,
-        _payment_rows(),
+        payment_rows,
         person_name="王怀宇",
         role="组长",
         project_ended=True,
@@ -326,10 +360,12 @@ def test_settle_person_verbose_includes_audit_and_cleaning_logs() -> None:
     assert "output_hash" in output
 
 
-def test_settle_person_run_id_is_unique() -> None:
+def test_settle_person_run_id_is_unique(
+    attendance_rows: Rows, payment_rows: Rows
+) -> None:
     first = settle_person(
-        _attendance_rows(),
-        _payment_rows(),
+        attendance_rows,
+        payment_rows,
         person_name="王怀宇",
         role="组长",
         project_ended=True,
@@ -337,8 +373,8 @@ def test_settle_person_run_id_is_unique() -> None:
         runtime_overrides={},
     )
     second = settle_person(
-        _attendance_rows(),
-        _payment_rows(),
+        attendance_rows,
+        payment_rows,
         person_name="王怀宇",
         role="组长",
         project_ended=True,
@@ -351,10 +387,12 @@ def test_settle_person_run_id_is_unique() -> None:
     assert first_match.group(1) != second_match.group(1)
 
 
-def test_settle_person_can_hide_audit_sections() -> None:
+def test_settle_person_can_hide_audit_sections(
+    attendance_rows: Rows, payment_rows: Rows
+) -> None:
     output = settle_person(
-        _attendance_rows(),
-        _payment_rows(),
+        attendance_rows,
+        payment_rows,
         person_name="王怀宇",
         role="组长",
         project_ended=True,
@@ -400,10 +438,12 @@ def test_settle_person_blocks_on_name_key_conflicts() -> None:
     assert "行号=1,2" in output
 
 
-def test_settle_person_compact_can_show_logs_when_enabled() -> None:
+def test_settle_person_compact_can_show_logs_when_enabled(
+    attendance_rows: Rows, payment_rows: Rows
+) -> None:
     output = settle_person(
-        _attendance_rows(),
-        _payment_rows(),
+        attendance_rows,
+        payment_rows,
         person_name="王怀宇",
         role="组长",
         project_ended=True,
@@ -416,10 +456,12 @@ def test_settle_person_compact_can_show_logs_when_enabled() -> None:
     assert re.search(r"日志：logs/[0-9a-f]{12}_[0-9a-f]{8}\.json", compressed)
 
 
-def test_settle_person_detail_can_hide_logs_when_disabled() -> None:
+def test_settle_person_detail_can_hide_logs_when_disabled(
+    attendance_rows: Rows, payment_rows: Rows
+) -> None:
     output = settle_person(
-        _attendance_rows(),
-        _payment_rows(),
+        attendance_rows,
+        payment_rows,
         person_name="王怀宇",
         role="组长",
         project_ended=True,
@@ -430,3 +472,137 @@ def test_settle_person_detail_can_hide_logs_when_disabled() -> None:
     detailed, compressed = output.split("\n\n")
     assert "日志：logs/" not in detailed
     assert "日志：logs/" not in compressed
+
+
+def test_settle_people_matches_individual_settlements(
+    attendance_rows: Rows, payment_rows: Rows, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settle_person_module, "_generate_run_id", lambda: "0" * 12)
+    specs = [
+        {
+            "person_name": name,
+            "role": role,
+            "project_ended": True,
+            "project_name": "测试项目",
+            "runtime_overrides": {},
+        }
+        for name, role in [("王怀宇", "组长"), ("张三", "组员"), ("李四", "组员")]
+    ]
+
+    batch = settle_people(attendance_rows, payment_rows, specs)
+
+    assert batch == [
+        settle_person(attendance_rows, payment_rows, **spec) for spec in specs
+    ]
+
+
+def test_settle_people_parallel_matches_sequential(
+    attendance_rows: Rows, payment_rows: Rows
+) -> None:
+    names = ["王怀宇", "张三", "李四", "赵五"]
+    specs = [
+        {
+            "person_name": names[index % len(names)],
+            "role": "组员",
+            "project_ended": True,
+            "project_name": "测试项目",
+            "runtime_overrides": {},
+        }
+        for index in range(settle_person_module.PARALLEL_MIN_SPECS)
+    ]
+
+    sequential = settle_people(attendance_rows, payment_rows, specs)
+    parallel = settle_people(
+        attendance_rows, payment_rows, specs, max_workers=2
+    )
+
+    assert _strip_run_ids(parallel) == _strip_run_ids(sequential)
+
+
+def test_input_hash_matches_full_payload_hash(
+    attendance_rows: Rows, payment_rows: Rows
+) -> None:
+    prepared = settle_person_module.prepare_inputs(
+        attendance_rows, payment_rows, project_name="测试项目"
+    )
+    command = {
+        "person_name": "张三",
+        "role": "组员",
+        "project_ended": True,
+        "project_name": "测试项目",
+    }
+
+    expected = settle_person_module._hash_payload(
+        {
+            "command": command,
+            "attendance_rows": list(attendance_rows),
+            "payment_rows": list(payment_rows),
+        }
+    )
+    assert settle_person_module._hash_input(prepared, command) == expected
+
+
+def test_settle_people_results_match_report_and_log(
+    attendance_rows: Rows, isolated_log_dir: Path
+) -> None:
+    payment_rows = [
+        {
+            "报销日期": "2025-11-04",
+            "报销金额": "300",
+            "报销状态": "状态无效",
+            "报销类型": "工资",
+            "报销人员": "王怀宇",
+            "项目": "测试项目",
+            "上传凭证": "V009",
+        }
+    ]
+    spec = {
+        "person_name": "王怀宇",
+        "role": "组长",
+        "project_ended": True,
+        "project_name": "测试项目",
+        "runtime_overrides": {},
+    }
+    blocked_spec = {
+        **spec,
+        "project_ended": None,
+        "runtime_overrides": {"require_project_ended": 1},
+    }
+
+    settled, blocked = settle_people_results(
+        attendance_rows, payment_rows, [spec, blocked_spec]
+    )
+
+    assert not settled.blocked
+    assert settled.pending_summary == {"状态无效": 1}
+    assert settled.blocking_codes == []
+    assert settled.log_path.parent == isolated_log_dir
+    assert f"日志：logs/{settled.log_path.name}" in settled.output_text
+    log_payload = json.loads(settled.log_path.read_text(encoding="utf-8"))
+    assert log_payload["pending_summary"] == settled.pending_summary
+    assert blocked.blocked
+    assert blocked.output_text.startswith("【阻断｜工资结算】")
+    assert blocked.blocking_codes == re.findall(
+        r"^- \[([A-Z0-9]+)\]", blocked.output_text, re.MULTILINE
+    )
+    assert "L" in blocked.blocking_codes
+
+
+def test_settle_people_reuses_prebuilt_attendance_index(
+    attendance_rows: Rows, payment_rows: Rows
+) -> None:
+    specs = [
+        {
+            "person_name": "张三",
+            "role": "组员",
+            "project_ended": True,
+            "project_name": project,
+            "runtime_overrides": {},
+        }
+        for project in ["测试项目", "其他项目"]
+    ]
+    index = build_attendance_index(attendance_rows, "测试项目")
+
+    assert _strip_run_ids(
+        settle_people(attendance_rows, payment_rows, specs, attendance_index=index)
+    ) == _strip_run_ids(settle_people(attendance_rows, payment_rows, specs))
@@ -1,5 +1,9 @@
+import concurrent.futures
+import os
 from pathlib import Path
 
+import pytest
+
 from tools import demo_settle_project
 from wage.command import parse_command
 
@@ -59,3 +63,30 @@ def test_settle_project_outputs_files(tmp_path: Path) -> None:
     assert "总人数：2" in summary
     assert "成功：2" in summary
 
+
+
+def test_settle_project_stays_in_process_by_default(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    project = "测试项目"
+    names = [f"组员{index}" for index in range(10)]
+    attendance_rows = [
+        {**_attendance_rows(project)[0], "姓名": name} for name in names
+    ]
+
+    def _no_pool(*args: object, **kwargs: object) -> None:
+        raise AssertionError("settle_project started a process pool")
+
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", _no_pool)
+    summary_path = demo_settle_project.settle_project(
+        attendance_rows,
+        _payment_rows(project),
+        command=parse_command(f"项目结算：项目={project} 项目已结束=是"),
+        project_name=project,
+        output_dir=tmp_path,
+        runtime_overrides={},
+    )
+
+    # The payment rows add 王怀宇 to the attendance crew.
+    assert f"总人数：{len(names) + 1}" in summary_path.read_text(encoding="utf-8")
@@ -5,10 +5,8 @@ import subprocess
 import sys
 from pathlib import Path
 
-
-def _write_csv(path: Path, headers: list[str]) -> None:
-    content = ",".join(headers) + "\n"
-    path.write_text(content, encoding="utf-8")
+from tests.csv_fixtures import write_csv
+from tools import wage_status
 
 
 def test_wage_status_only_mode(tmp_path: Path) -> None:
@@ -25,8 +23,8 @@ def test_wage_status_only_mode(tmp_path: Path) -> None:
     try:
         attendance_csv = data_current / "00_出勤_ONLY.csv"
         payment_csv = data_current / "99_报销_ONLY.csv"
-        _write_csv(attendance_csv, ["施工日期", "是否施工", "实际出勤人员"])
-        _write_csv(payment_csv, ["报销日期", "报销人员", "报销金额", "报销类型", "报销状态"])
+        write_csv(attendance_csv, ["施工日期", "是否施工", "实际出勤人员"])
+        write_csv(payment_csv, ["报销日期", "报销人员", "报销金额", "报销类型", "报销状态"])
 
         result = subprocess.run(
             [sys.executable, "-m", "tools.wage_status"],
@@ -61,8 +59,8 @@ def test_wage_status_split_compatible_mode(tmp_path: Path) -> None:
     try:
         attendance_csv = data_current / "00_施工表_兼容.csv"
         payment_csv = data_current / "99_报销表_兼容.csv"
-        _write_csv(attendance_csv, ["施工日期", "是否施工", "实际出勤人员"])
-        _write_csv(payment_csv, ["报销日期", "报销人员", "报销金额", "报销类型", "报销状态"])
+        write_csv(attendance_csv, ["施工日期", "是否施工", "实际出勤人员"])
+        write_csv(payment_csv, ["报销日期", "报销人员", "报销金额", "报销类型", "报销状态"])
 
         result = subprocess.run(
             [sys.executable, "-m", "tools.wage_status"],
@@ -79,3 +77,15 @@ def test_wage_status_split_compatible_mode(tmp_path: Path) -> None:
             shutil.rmtree(data_current)
         if backup_dir is not None:
             backup_dir.rename(data_current)
+
+
+def test_parse_branch_status_matches_separate_git_calls() -> None:
+    clean = "# branch.oid abc123\n# branch.head main\n# branch.ab +0 -0"
+    detached = "# branch.oid abc123\n# branch.head (detached)\n? notes.txt"
+
+    assert wage_status._parse_branch_status(clean) == ("main", False)
+    assert wage_status._parse_branch_status(detached) == ("HEAD", True)
+    assert wage_status._parse_branch_status(wage_status.GIT_UNAVAILABLE) == (
+        wage_status.GIT_UNAVAILABLE,
+        True,
+    )
@@ -0,0 +1,114 @@
+"""CSV header helpers shared by the demo and status tools."""
+from __future__ import annotations
+
+import csv
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from stat import S_ISREG
+from typing import Callable, Iterable, Iterator, TypeVar
+
+HEADER_READ_SIZE = 8192
+# Header reads are I/O bound; overlap them across files once there are enough.
+SCAN_THREAD_MIN_FILES = 3
+SCAN_MAX_THREADS = 8
+# Joins headers into one searchable string; never occurs in a keyword, so a
+# match cannot span two headers.
+HEADER_SEPARATOR = "\x01"
+
+_HEADER_TRANSLATION = str.maketrans({"\ufeff": None, "（": "(", "）": ")", "　": " "})
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def read_first_line(path: Path) -> bytes:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        buffer = b""
+        while True:
+            chunk = os.read(fd, HEADER_READ_SIZE)
+            buffer += chunk
+            if not chunk or b"\n" in chunk or b"\r" in chunk or b"\0" in chunk:
+                break
+    finally:
+        os.close(fd)
+    return buffer.split(b"\n", 1)[0].split(b"\r", 1)[0]
+
+
+def read_headers(path: Path) -> list[str]:
+    """Return the header record of ``path``; binary files have no headers."""
+    raw = read_first_line(path)
+    if b"\0" in raw:
+        return []
+    line = raw.decode("utf-8-sig")
+    if line.count('"') % 2:
+        # A quoted header spans lines; let the csv module read the full record.
+        with path.open("r", encoding="utf-8-sig", newline="") as handle:
+            return next(csv.reader(handle), [])
+    return next(csv.reader([line]), [])
+
+
+@lru_cache(maxsize=8192)
+def clean_header(text: str) -> str:
+    # Interned so a column name shared by many files is one object everywhere,
+    # even after it drops out of the cache.
+    cleaned = _WHITESPACE_RE.sub(" ", text.translate(_HEADER_TRANSLATION).strip())
+    return sys.intern(cleaned)
+
+
+def join_headers(headers: list[str]) -> str:
+    """Join headers into one blob so each keyword is a single substring search."""
+    return HEADER_SEPARATOR.join(headers)
+
+
+def count_keywords(header_blob: str, keywords: Iterable[str]) -> int:
+    """Count keywords occurring in a :func:`join_headers` blob."""
+    return sum(1 for keyword in keywords if keyword in header_blob)
+
+
+def summarize_headers(headers: list[str], limit: int = 30) -> str:
+    if not headers:
+        return "(空表头)"
+    if len(headers) <= limit:
+        return "｜".join(headers)
+    return "｜".join(headers[:limit]) + f"...(共{len(headers)}列)"
+
+
+def iter_csvs(root: Path) -> Iterator[tuple[Path, os.stat_result]]:
+    """Yield regular ``*.csv`` files under ``root`` with their stat, like ``rglob``.
+
+    Files of a directory come before its subdirectories, which are walked
+    depth-first; symlinked directories are not followed.
+    """
+    pending = [os.fspath(root)]
+    while pending:
+        directory = pending.pop()
+        subdirs: list[str] = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name.endswith(".csv"):
+                        try:
+                            stat_result = entry.stat()
+                        except OSError:
+                            continue
+                        if S_ISREG(stat_result.st_mode):
+                            yield Path(entry.path), stat_result
+        except OSError:
+            continue
+        pending.extend(reversed(subdirs))
+
+
+def scan_map(detect: Callable[[_T], _R], items: list[_T]) -> list[_R]:
+    """Apply ``detect`` to every item in order, on threads for larger batches."""
+    if len(items) < SCAN_THREAD_MIN_FILES:
+        return [detect(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(SCAN_MAX_THREADS, len(items))) as executor:
+        return list(executor.map(detect, items))
@@ -1,66 +1,95 @@
 """Demo entrypoint for wage settlement."""
 from __future__ import annotations
 
-import csv
+import os
 import re
 import sys
-from dataclasses import dataclass
+from bisect import bisect_right
+from dataclasses import dataclass, replace
 from datetime import datetime
 from pathlib import Path
+from typing import Mapping
 
 from wage.command import expand_wage_passphrase_commands, parse_command
-from wage.settle_person import settle_person
-
-ATTENDANCE_KEYWORDS = [
-    "日期",
-    "施工日期",
-    "工作日期",
-    "姓名",
-    "施工人员",
-    "实际出勤人员",
-    "项目名",
-    "项目",
-    "项目名称",
-    "是否施工",
-    "出勤模式",
-    "车辆",
-    "车牌",
-]
-ATTENDANCE_STRONG_KEYWORDS = [
-    "是否施工",
-    "出勤模式",
-    "车辆",
-    "车牌",
-    "施工人员",
-    "实际出勤人员",
-]
-PAYMENT_KEYWORDS = [
-    "报销类型",
-    "费用类型",
-    "报销人员",
-    "姓名",
-    "报销日期",
-    "日期",
-    "报销金额",
-    "金额",
-    "报销状态",
-    "状态",
-    "上传凭证",
-    "凭证号",
-    "报销说明",
-    "备注",
-    "项目",
-    "项目名",
-]
-PAYMENT_STRONG_KEYWORDS = [
-    "报销类型",
-    "费用类型",
-    "报销金额",
-    "报销状态",
-    "上传凭证",
-    "凭证号",
-    "报销说明",
-]
+from wage.io import read_rows
+from wage.settle_person import settle_people, settle_person
+
+from ._csv_io import (
+    HEADER_SEPARATOR,
+    clean_header,
+    iter_csvs,
+    join_headers,
+    read_headers,
+    scan_map,
+    summarize_headers,
+)
+
+ATTENDANCE_KEYWORDS = frozenset(
+    {
+        "日期",
+        "施工日期",
+        "工作日期",
+        "姓名",
+        "施工人员",
+        "实际出勤人员",
+        "项目名",
+        "项目",
+        "项目名称",
+        "是否施工",
+        "出勤模式",
+        "车辆",
+        "车牌",
+    }
+)
+ATTENDANCE_STRONG_KEYWORDS = frozenset(
+    {
+        "是否施工",
+        "出勤模式",
+        "车辆",
+        "车牌",
+        "施工人员",
+        "实际出勤人员",
+    }
+)
+PAYMENT_KEYWORDS = frozenset(
+    {
+        "报销类型",
+        "费用类型",
+        "报销人员",
+        "姓名",
+        "报销日期",
+        "日期",
+        "报销金额",
+        "金额",
+        "报销状态",
+        "状态",
+        "上传凭证",
+        "凭证号",
+        "报销说明",
+        "备注",
+        "项目",
+        "项目名",
+    }
+)
+PAYMENT_STRONG_KEYWORDS = frozenset(
+    {
+        "报销类型",
+        "费用类型",
+        "报销金额",
+        "报销状态",
+        "上传凭证",
+        "凭证号",
+        "报销说明",
+    }
+)
+
+# Every scored keyword, so each is searched once per file across all four sets.
+_SCORED_KEYWORDS = (
+    ATTENDANCE_KEYWORDS
+    | ATTENDANCE_STRONG_KEYWORDS
+    | PAYMENT_KEYWORDS
+    | PAYMENT_STRONG_KEYWORDS
+)
 
 ATTENDANCE_FIELD_CANDIDATES = {
     "日期": ["施工日期", "日期", "工作日期", "出勤日期"],
@@ -78,8 +107,17 @@ PAYMENT_FIELD_CANDIDATES = {
     "状态": ["报销状态", "状态", "付款状态"],
     "凭证": ["上传凭证", "凭证号", "凭证", "票据号", "流水号", "订单号"],
 }
+# Field candidates cleaned once, in priority order and without repeats.
+_CLEANED_ATTENDANCE_FIELDS = {
+    field: tuple(dict.fromkeys(map(clean_header, candidates)))
+    for field, candidates in ATTENDANCE_FIELD_CANDIDATES.items()
+}
+_CLEANED_PAYMENT_FIELDS = {
+    field: tuple(dict.fromkeys(map(clean_header, candidates)))
+    for field, candidates in PAYMENT_FIELD_CANDIDATES.items()
+}
 
-COMMON_SUFFIXES = [
+COMMON_SUFFIXES = (
     "出勤表",
     "施工表",
     "考勤表",
@@ -91,10 +129,10 @@ COMMON_SUFFIXES = [
     "_表格",
     "_问卷",
     "_收集结果",
-]
+)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CsvCandidate:
     path: Path
     attendance_score: int
@@ -109,80 +147,88 @@ class CsvCandidate:
 ATTENDANCE_SCORE_THRESHOLD = 2
 PAYMENT_SCORE_THRESHOLD = 2
 
-
-def _read_csv(path: Path) -> list[dict[str, str]]:
-    with path.open("r", encoding="utf-8-sig") as handle:
-        reader = csv.DictReader(handle)
-        return list(reader)
+_RUNTIME_OVERRIDE_RE = re.compile(
+    r"\b("
+    r"verbose|show_notes|show_checks|show_audit|"
+    r"show_logs_in_compact|show_logs_in_detail"
+    r")\s*[:=]\s*(\d+)\b"
+)
+# Copy counters added by file managers, e.g. "考勤 (1)" or "考勤（2）".
+_COPY_SUFFIX_RE = re.compile(r"(\s*\(\d+\)|\s*（\d+）)$")
 
 
-def _read_headers(path: Path) -> list[str]:
-    with path.open("r", encoding="utf-8-sig") as handle:
-        reader = csv.reader(handle)
-        return next(reader, [])
+def _read_csv(path: Path) -> list[Mapping[str, str]]:
+    # Rows are only read downstream, so the compact tuple-backed form is enough.
+    return read_rows(path, compact=True)
 
 
-def _clean_header(text: str) -> str:
-    cleaned = (
-        text.replace("\ufeff", "")
-        .replace("（", "(")
-        .replace("）", ")")
-        .replace("　", " ")
-    )
-    cleaned = re.sub(r"\s+", " ", cleaned.strip())
-    return cleaned
+def _read_input_rows(
+    selected: tuple[Path, Path],
+) -> tuple[list[Mapping[str, str]], list[Mapping[str, str]]]:
+    """Read the attendance and payment rows, parsing a combined table once."""
+    attendance_rows = _read_csv(selected[0])
+    if selected[1] == selected[0]:
+        return attendance_rows, attendance_rows
+    return attendance_rows, _read_csv(selected[1])
 
 
 def _build_header_map(headers: list[str]) -> tuple[list[str], dict[str, str]]:
     cleaned_headers: list[str] = []
     header_map: dict[str, str] = {}
     for header in headers:
-        cleaned = _clean_header(header)
+        cleaned = clean_header(header)
         cleaned_headers.append(cleaned)
         header_map.setdefault(cleaned, header)
     return cleaned_headers, header_map
 
 
-def _score_headers(headers: list[str], keywords: list[str]) -> int:
-    hits: set[str] = set()
-    for header in headers:
-        for keyword in keywords:
-            if keyword in header:
-                hits.add(keyword)
-    return len(hits)
-
-
-def detect_table_role(path: Path) -> CsvCandidate:
-    headers = _read_headers(path)
+def _build_candidate(path: Path, headers: list[str], mtime: float) -> CsvCandidate:
     cleaned_headers, header_map = _build_header_map(headers)
+    header_blob = join_headers(cleaned_headers)
+    hits = {keyword for keyword in _SCORED_KEYWORDS if keyword in header_blob}
     return CsvCandidate(
         path=path,
-        attendance_score=_score_headers(cleaned_headers, ATTENDANCE_KEYWORDS),
-        attendance_strong_hits=_score_headers(cleaned_headers, ATTENDANCE_STRONG_KEYWORDS),
-        payment_score=_score_headers(cleaned_headers, PAYMENT_KEYWORDS),
-        payment_strong_hits=_score_headers(cleaned_headers, PAYMENT_STRONG_KEYWORDS),
+        attendance_score=len(hits & ATTENDANCE_KEYWORDS),
+        attendance_strong_hits=len(hits & ATTENDANCE_STRONG_KEYWORDS),
+        payment_score=len(hits & PAYMENT_KEYWORDS),
+        payment_strong_hits=len(hits & PAYMENT_STRONG_KEYWORDS),
         cleaned_headers=cleaned_headers,
         header_map=header_map,
-        mtime=path.stat().st_mtime,
+        mtime=mtime,
     )
 
 
+def _detect_with_stat(path: Path, stat_result: os.stat_result) -> CsvCandidate:
+    # Empty files cannot carry a header; score them without opening them.
+    headers = read_headers(path) if stat_result.st_size else []
+    return _build_candidate(path, headers, stat_result.st_mtime)
+
+
+def detect_table_role(path: Path) -> CsvCandidate:
+    return _detect_with_stat(path, path.stat())
+
+
 def _scan_csv_candidates(data_dir: Path) -> list[CsvCandidate]:
+    """Detect every CSV under ``data_dir``."""
     if not data_dir.exists():
         return []
-    candidates: list[CsvCandidate] = []
-    for path in data_dir.rglob("*.csv"):
-        if not path.is_file():
-            continue
-        candidates.append(detect_table_role(path))
-    return candidates
+    return scan_map(lambda entry: _detect_with_stat(*entry), list(iter_csvs(data_dir)))
 
 
 def _format_relative_path(path: Path, base_dir: Path) -> str:
-    try:
-        return str(path.relative_to(base_dir))
-    except ValueError:
-        return str(path)
+    """Like ``str(path.relative_to(base_dir))``, falling back to ``str(path)``.
+
+    Compares path strings directly instead of building ``parts`` tuples.
+    """
+    text = os.fspath(path)
+    base = os.fspath(base_dir)
+    prefix = base if base.endswith(os.sep) else base + os.sep
+    folded = os.path.normcase(text)
+    if folded.startswith(os.path.normcase(prefix)):
+        return text[len(prefix) :]
+    if folded == os.path.normcase(base):
+        return "."
+    return text
 
 
 def _format_mtime(timestamp: float) -> str:
@@ -239,72 +285,87 @@ def _resolve_input_paths(data_dir: Path) -> tuple[Path, Path] | None:
     return selected[0].path, selected[1].path
 
 
-def _select_input_paths(
-    candidates: list[CsvCandidate],
-) -> tuple[CsvCandidate, CsvCandidate] | None:
-    if not candidates:
-        return None
-
-    combined = [
-        candidate
-        for candidate in candidates
-        if candidate.attendance_score >= ATTENDANCE_SCORE_THRESHOLD
+def _is_attendance_candidate(candidate: CsvCandidate) -> bool:
+    return (
+        candidate.attendance_score >= ATTENDANCE_SCORE_THRESHOLD
         and candidate.attendance_strong_hits >= 1
-        and candidate.payment_score >= PAYMENT_SCORE_THRESHOLD
-        and candidate.payment_strong_hits >= 1
-    ]
-    if len(candidates) == 1 and len(combined) == 1:
-        candidate = combined[0]
-        return candidate, candidate
-    if combined:
-        return None
+    )
 
-    attendance_candidates = [
-        candidate
-        for candidate in candidates
-        if candidate.attendance_score >= ATTENDANCE_SCORE_THRESHOLD
-        and candidate.attendance_strong_hits >= 1
-    ]
-    payment_candidates = [
-        candidate
-        for candidate in candidates
-        if candidate.payment_score >= PAYMENT_SCORE_THRESHOLD
-        and candidate.payment_strong_hits >= 1
-    ]
 
-    if len(attendance_candidates) == 1 and len(payment_candidates) == 1:
-        attendance = attendance_candidates[0]
-        payment = payment_candidates[0]
-        if attendance.path != payment.path:
-            return attendance, payment
-    return None
+def _is_payment_candidate(candidate: CsvCandidate) -> bool:
+    return (
+        candidate.payment_score >= PAYMENT_SCORE_THRESHOLD
+        and candidate.payment_strong_hits >= 1
+    )
 
 
-def _summarize_headers(headers: list[str], limit: int = 30) -> str:
-    if not headers:
-        return "(空表头)"
-    if len(headers) <= limit:
-        return "｜".join(headers)
-    return "｜".join(headers[:limit]) + f"...(共{len(headers)}列)"
+def _select_input_paths(
+    candidates: list[CsvCandidate],
+) -> tuple[CsvCandidate, CsvCandidate] | None:
+    """Pick the attendance and payment tables in one pass over the candidates.
+
+    A combined table is only accepted when it is the sole CSV; otherwise its
+    presence makes the choice ambiguous, so the scan stops at the first one.
+    """
+    attendance: CsvCandidate | None = None
+    payment: CsvCandidate | None = None
+    ambiguous = False
+    for candidate in candidates:
+        is_attendance = _is_attendance_candidate(candidate)
+        is_payment = _is_payment_candidate(candidate)
+        if is_attendance and is_payment:
+            return (candidate, candidate) if len(candidates) == 1 else None
+        if is_attendance:
+            ambiguous = ambiguous or attendance is not None
+            attendance = candidate
+        elif is_payment:
+            ambiguous = ambiguous or payment is not None
+            payment = candidate
+    if ambiguous or attendance is None or payment is None:
+        return None
+    return attendance, payment
 
 
-def _match_header(
+def _first_matching_header(
     cleaned_headers: list[str],
     header_map: dict[str, str],
-    candidates: list[str],
+    cleaned_candidates: tuple[str, ...],
+    header_blob: str,
 ) -> str | None:
-    normalized_candidates = [_clean_header(item) for item in candidates]
-    for candidate in normalized_candidates:
-        for header in cleaned_headers:
-            if header == candidate or candidate in header:
-                return header_map.get(header, header)
+    """Return the first header containing the earliest matching candidate.
+
+    ``header_blob`` is :func:`join_headers` of ``cleaned_headers``; each
+    candidate costs a single C-level ``find`` on it, and the hit is mapped
+    back to its header by offset.
+    """
+    if not cleaned_headers:
+        return None
+    starts: list[int] | None = None
+    for candidate in cleaned_candidates:
+        position = header_blob.find(candidate)
+        if position < 0:
+            continue
+        if starts is None:
+            starts = []
+            offset = 0
+            for header in cleaned_headers:
+                starts.append(offset)
+                offset += len(header) + len(HEADER_SEPARATOR)
+        header = cleaned_headers[bisect_right(starts, position) - 1]
+        return header_map.get(header, header)
     return None
 
 
-def _build_field_mapping(candidate: CsvCandidate, mapping: dict[str, list[str]]) -> dict[str, str]:
+def _build_field_mapping(
+    candidate: CsvCandidate, mapping: dict[str, tuple[str, ...]]
+) -> dict[str, str]:
+    """Resolve each field from pre-cleaned candidates (see ``_CLEANED_*_FIELDS``)."""
+    header_blob = join_headers(candidate.cleaned_headers)
     resolved: dict[str, str] = {}
     for field, candidates in mapping.items():
-        matched = _match_header(candidate.cleaned_headers, candidate.header_map, candidates)
+        matched = _first_matching_header(
+            candidate.cleaned_headers, candidate.header_map, candidates, header_blob
+        )
         resolved[field] = matched or "未命中"
     return resolved
 
@@ -314,84 +375,67 @@ def _print_selection_audit(
     payment: CsvCandidate,
     base_dir: Path,
 ) -> None:
-    print("选表审计：")
-    print(f"- 出勤表: {_format_relative_path(attendance.path, base_dir)}")
-    print(f"- 报销表: {_format_relative_path(payment.path, base_dir)}")
-    print(
+    attendance_mapping = _build_field_mapping(attendance, _CLEANED_ATTENDANCE_FIELDS)
+    payment_mapping = _build_field_mapping(payment, _CLEANED_PAYMENT_FIELDS)
+    lines = [
+        "选表审计：",
+        f"- 出勤表: {_format_relative_path(attendance.path, base_dir)}",
+        f"- 报销表: {_format_relative_path(payment.path, base_dir)}",
         "- 出勤表命中: "
         f"出勤命中 {attendance.attendance_score}, "
         f"报销命中 {attendance.payment_score}, "
-        f"差值 {attendance.attendance_score - attendance.payment_score}"
-    )
-    print(
+        f"差值 {attendance.attendance_score - attendance.payment_score}",
         "- 报销表命中: "
         f"出勤命中 {payment.attendance_score}, "
         f"报销命中 {payment.payment_score}, "
-        f"差值 {payment.payment_score - payment.attendance_score}"
-    )
-    attendance_headers = _summarize_headers(attendance.cleaned_headers)
-    payment_headers = _summarize_headers(payment.cleaned_headers)
-    print(f"- 出勤表表头(清洗): {attendance_headers}")
-    print(f"- 报销表表头(清洗): {payment_headers}")
-    attendance_mapping = _build_field_mapping(attendance, ATTENDANCE_FIELD_CANDIDATES)
-    payment_mapping = _build_field_mapping(payment, PAYMENT_FIELD_CANDIDATES)
-    print(
+        f"差值 {payment.payment_score - payment.attendance_score}",
+        f"- 出勤表表头(清洗): {summarize_headers(attendance.cleaned_headers)}",
+        f"- 报销表表头(清洗): {summarize_headers(payment.cleaned_headers)}",
         "- 出勤表字段映射: "
-        + "，".join(f"{key}={value}" for key, value in attendance_mapping.items())
-    )
-    print(
+        + "，".join(f"{key}={value}" for key, value in attendance_mapping.items()),
         "- 报销表字段映射: "
-        + "，".join(f"{key}={value}" for key, value in payment_mapping.items())
-    )
+        + "，".join(f"{key}={value}" for key, value in payment_mapping.items()),
+    ]
+    print("\n".join(lines))
 
 
-def _print_candidate_report(candidates: list[CsvCandidate], base_dir: Path) -> None:
-    print("候选清单：")
-    for candidate in sorted(candidates, key=lambda item: item.path.name):
-        rel_path = _format_relative_path(candidate.path, base_dir)
-        print(
-            f"- {rel_path}: "
-            f"mtime={_format_mtime(candidate.mtime)}, "
-            f"出勤命中 {candidate.attendance_score}, "
-            f"报销命中 {candidate.payment_score}, "
-            f"表头: {_summarize_headers(candidate.cleaned_headers)}"
-        )
+def _candidate_report_lines(candidates: list[CsvCandidate], base_dir: Path) -> list[str]:
+    return ["候选清单："] + [
+        f"- {_format_relative_path(candidate.path, base_dir)}: "
+        f"mtime={_format_mtime(candidate.mtime)}, "
+        f"出勤命中 {candidate.attendance_score}, "
+        f"报销命中 {candidate.payment_score}, "
+        f"表头: {summarize_headers(candidate.cleaned_headers)}"
+        for candidate in sorted(candidates, key=lambda item: item.path.name)
+    ]
 
 
 def _print_blocking_reason(candidates: list[CsvCandidate], base_dir: Path) -> None:
     attendance_candidates = [
-        candidate
-        for candidate in candidates
-        if candidate.attendance_score >= ATTENDANCE_SCORE_THRESHOLD
-        and candidate.attendance_strong_hits >= 1
+        candidate for candidate in candidates if _is_attendance_candidate(candidate)
     ]
     payment_candidates = [
-        candidate
-        for candidate in candidates
-        if candidate.payment_score >= PAYMENT_SCORE_THRESHOLD
-        and candidate.payment_strong_hits >= 1
+        candidate for candidate in candidates if _is_payment_candidate(candidate)
     ]
     combined_candidates = [
         candidate
-        for candidate in candidates
-        if candidate.attendance_score >= ATTENDANCE_SCORE_THRESHOLD
-        and candidate.attendance_strong_hits >= 1
-        and candidate.payment_score >= PAYMENT_SCORE_THRESHOLD
-        and candidate.payment_strong_hits >= 1
+        for candidate in attendance_candidates
+        if _is_payment_candidate(candidate)
     ]
-    print("【阻断｜选表】无法唯一确定出勤/报销表。")
+    lines = ["【阻断｜选表】无法唯一确定出勤/报销表。"]
     if combined_candidates and len(candidates) > 1:
-        print("检测到合并表候选，但同时存在其他CSV。")
+        lines.append("检测到合并表候选，但同时存在其他CSV。")
     if not attendance_candidates:
-        print("缺少可识别的施工/出勤表。")
+        lines.append("缺少可识别的施工/出勤表。")
     if not payment_candidates:
-        print("缺少可识别的报销/支付表。")
+        lines.append("缺少可识别的报销/支付表。")
     if len(attendance_candidates) > 1:
-        print("发现多份施工/出勤候选表。")
+        lines.append("发现多份施工/出勤候选表。")
     if len(payment_candidates) > 1:
-        print("发现多份报销/支付候选表。")
-    _print_candidate_report(candidates, base_dir)
-    print("请把不需要的 CSV 移出 data/当前 后重试（不要求改名）。")
+        lines.append("发现多份报销/支付候选表。")
+    lines.extend(_candidate_report_lines(candidates, base_dir))
+    lines.append("请把不需要的 CSV 移出 data/当前 后重试（不要求改名）。")
+    print("\n".join(lines))
 
 
 def _read_command_file(command_path: Path) -> str | None:
@@ -399,24 +443,22 @@ def _read_command_file(command_path: Path) -> str | None:
         print("未找到口令文件，请创建 data/当前/口令.txt（UTF-8）")
         print("示例口令：工资：王怀宇 组长 项目已结束=是 项目=溧马一溧芜设标-凌云")
         return None
-    return command_path.read_text(encoding="utf-8").strip()
+    # utf-8-sig drops a BOM left by Windows editors before any line checks.
+    return command_path.read_bytes().decode("utf-8-sig").strip()
 
 
 def _read_runtime_overrides(config_path: Path) -> dict[str, int]:
     if not config_path.exists():
         return {}
     overrides: dict[str, int] = {}
-    for line in config_path.read_text(encoding="utf-8").splitlines():
+    for line in config_path.read_bytes().decode("utf-8").splitlines():
         stripped = line.strip()
         if not stripped or stripped.startswith("#"):
             continue
-        match = re.search(
-            r"\b("
-            r"verbose|show_notes|show_checks|show_audit|"
-            r"show_logs_in_compact|show_logs_in_detail"
-            r")\s*[:=]\s*(\d+)\b",
-            stripped,
-        )
+        # Every override is written as key=value or key:value.
+        if "=" not in stripped and ":" not in stripped:
+            continue
+        match = _RUNTIME_OVERRIDE_RE.search(stripped)
         if match:
             overrides[match.group(1)] = int(match.group(2))
     return overrides
@@ -430,11 +472,12 @@ def _append_audit_note(runtime_overrides: dict[str, object], note: str) -> None:
 
 def _derive_project_name(path: Path) -> str:
     name = path.stem
-    name = re.sub(r"(\s*\(\d+\)|\s*（\d+）)$", "", name)
-    for suffix in COMMON_SUFFIXES:
-        if name.endswith(suffix):
-            name = name[: -len(suffix)]
-            break
+    name = _COPY_SUFFIX_RE.sub("", name)
+    if name.endswith(COMMON_SUFFIXES):
+        for suffix in COMMON_SUFFIXES:
+            if name.endswith(suffix):
+                name = name[: -len(suffix)]
+                break
     return name.strip("-_")
 
 
@@ -455,8 +498,7 @@ def main() -> int:
     if selected is None:
         return 0
 
-    attendance_rows = _read_csv(selected[0])
-    payment_rows = _read_csv(selected[1])
+    attendance_rows, payment_rows = _read_input_rows(selected)
 
     expanded_lines, audit_lines, errors = expand_wage_passphrase_commands(
         command_text,
@@ -478,84 +520,76 @@ def main() -> int:
     lines = [line.strip() for line in expanded_lines if line.strip()]
     wage_lines = [line for line in lines if line.startswith("工资：")]
     global_lines = [line for line in lines if not line.startswith("工资：")]
+    config_overrides = _read_runtime_overrides(data_dir / "当前" / "配置.txt")
 
-    def _run_single(command_source: str, *, print_output: bool = True) -> str:
+    def _build_spec(command_source: str) -> dict[str, object] | None:
         command = parse_command(command_source)
-        if command.get("mode") == "project":
+        if command.mode == "project":
             from . import demo_settle_project
 
             demo_settle_project.main()
-            return ""
-        runtime_overrides = dict(command.get("runtime_overrides") or {})
-        if command.get("project_name"):
+            return None
+        runtime_overrides = dict(command.runtime_overrides or {})
+        if command.project_name:
             runtime_overrides["project_name_source"] = "command"
-        if not command.get("project_name"):
+        if not command.project_name:
             derived_project = _derive_project_name(selected[0])
-            command["project_name"] = derived_project
+            command = replace(command, project_name=derived_project)
             if derived_project:
                 runtime_overrides["project_name_source"] = "derived"
                 _append_audit_note(
                     runtime_overrides,
                     f"项目名未显式指定，已使用兜底：{derived_project}",
                 )
-        config_path = data_dir / "当前" / "配置.txt"
-        runtime_overrides.update(_read_runtime_overrides(config_path))
+        runtime_overrides.update(config_overrides)
         runtime_overrides["attendance_source"] = _format_relative_path(
             selected[0], repo_root
         )
         runtime_overrides["payment_source"] = _format_relative_path(
             selected[1], repo_root
         )
-
-        output = settle_person(
-            attendance_rows,
-            payment_rows,
-            person_name=command.get("person_name"),
-            role=command.get("role"),
-            project_ended=command.get("project_ended"),
-            project_name=command.get("project_name"),
-            runtime_overrides=runtime_overrides,
-        )
-        if print_output:
-            print(output)
-        return output
+        return {
+            "person_name": command.person_name,
+            "role": command.role,
+            "project_ended": command.project_ended,
+            "project_name": command.project_name,
+            "runtime_overrides": runtime_overrides,
+        }
 
     if len(wage_lines) <= 1:
-        _run_single("\n".join(lines))
+        spec = _build_spec("\n".join(lines))
+        if spec is not None:
+            print(settle_person(attendance_rows, payment_rows, **spec))
         return 0
 
-    temp_path = data_dir / "当前" / "._口令_单人临时.txt"
-    try:
-        outputs: list[str] = []
-        for index, wage_line in enumerate(wage_lines):
-            temp_content = "\n".join(global_lines + [wage_line])
-            temp_path.write_text(temp_content, encoding="utf-8")
-            temp_command_text = _read_command_file(temp_path)
-            if temp_command_text:
-                outputs.append(_run_single(temp_command_text, print_output=False))
-        marker = "【压缩版】"
-        detailed_parts: list[str] = []
-        compact_parts: list[str] = []
-        for text in outputs:
-            if marker in text:
-                detailed_part, compact_tail = text.split(marker, 1)
-                detailed_parts.append(detailed_part.rstrip())
-                compact_parts.append(marker + compact_tail)
-            else:
-                detailed_parts.append(text.rstrip())
-                compact_parts.append("")
-        for index, detailed_part in enumerate(detailed_parts):
-            print(detailed_part)
-            if index != len(detailed_parts) - 1:
-                print()
-        print("【压缩版合集】")
-        for index, compact_part in enumerate(compact_parts):
-            print(compact_part)
-            if index != len(compact_parts) - 1:
-                print()
-    finally:
-        if temp_path.exists():
-            temp_path.unlink()
+    # Each wage line is settled with the shared global lines, straight from memory.
+    specs = [
+        _build_spec("\n".join(global_lines + [wage_line])) for wage_line in wage_lines
+    ]
+    settled = iter(
+        settle_people(
+            attendance_rows,
+            payment_rows,
+            [spec for spec in specs if spec is not None],
+        )
+    )
+    outputs = ["" if spec is None else next(settled) for spec in specs]
+    marker = "【压缩版】"
+    detailed_parts: list[str] = []
+    compact_parts: list[str] = []
+    for text in outputs:
+        if marker in text:
+            detailed_part, compact_tail = text.split(marker, 1)
+            detailed_parts.append(detailed_part.rstrip())
+            compact_parts.append(marker + compact_tail)
+        else:
+            detailed_parts.append(text.rstrip())
+            compact_parts.append("")
+    print(
+        "\n\n".join(detailed_parts)
+        + "\n【压缩版合集】\n"
+        + "\n\n".join(compact_parts)
+    )
     return 0
 
 
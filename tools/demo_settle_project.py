@@ -1,23 +1,39 @@
 """Demo entrypoint for project batch settlement."""
 from __future__ import annotations
 
-import json
-import re
+import os
 import sys
-from dataclasses import dataclass
+from collections import ChainMap
+from dataclasses import dataclass, replace
 from decimal import Decimal
 from pathlib import Path
-from typing import Iterable
-
-from wage.attendance_pipe import collect_attendance_people, compute_attendance
-from wage.command import parse_command
+from typing import Callable, Iterable, Mapping
+
+from wage.attendance_pipe import (
+    build_attendance_index,
+    collect_attendance_people,
+    compute_attendance,
+)
+from wage.command import Command, parse_command
 from wage.payment_pipe import collect_payment_people
-from wage.name_utils import name_key, normalize_name_map
-from wage.settle_person import DAILY_WAGE_MAP, ROLE_WAGE_MAP, settle_person
+from wage.name_utils import name_key
+from wage.settle_person import (
+    NORMALIZED_DAILY_WAGE_MAP,
+    ROLE_WAGE_MAP,
+    settle_people_results,
+)
 
 from . import demo_settle_person
 
-NORMALIZED_DAILY_WAGE_MAP = normalize_name_map(DAILY_WAGE_MAP)
+# Known pending reasons in report order; any others follow alphabetically.
+PENDING_REASON_ORDER = (
+    "状态缺失",
+    "通过但状态缺失",
+    "未通过",
+    "状态无效",
+    "类别待确认",
+    "金额缺失",
+)
 
 
 @dataclass(frozen=True)
@@ -48,30 +64,12 @@ def _resolve_input_paths(data_dir: Path) -> tuple[Path, Path] | None:
     return selected[0].path, selected[1].path
 
 
-def _parse_blocking_codes(output: str) -> list[str]:
-    codes: list[str] = []
-    for line in output.splitlines():
-        match = re.match(r"- \[([A-Z0-9]+)\]", line)
-        if match:
-            codes.append(match.group(1))
-    return codes
-
-
-def _extract_log_path(output: str) -> Path | None:
-    match = re.search(r"日志：logs/([^\s]+\.json)", output)
-    if not match:
-        return None
-    return Path("logs") / match.group(1)
-
-
-def _load_pending_summary(log_path: Path | None) -> dict[str, int]:
-    if not log_path or not log_path.exists():
-        return {}
-    payload = json.loads(log_path.read_text(encoding="utf-8"))
-    pending_summary = payload.get("pending_summary")
-    if isinstance(pending_summary, dict):
-        return {key: int(value) for key, value in pending_summary.items()}
-    return {}
+def _write_text(path: Path, text: str) -> None:
+    # Encoded once and written as bytes, skipping the text-IO layer; line
+    # endings still follow the platform, as with ``write_text``.
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)
+    path.write_bytes(text.encode("utf-8"))
 
 
 def _resolve_role(
@@ -112,18 +110,29 @@ def _render_summary(
     role_sources: dict[str, tuple[str, str]],
 ) -> str:
     total = len(people)
-    blocked = sum(1 for person in people if person.blocked)
-    success = total - blocked
-    pending_people = sum(1 for person in people if person.pending_count > 0)
-    pending_items = sum(person.pending_count for person in people)
+    blocked = 0
+    pending_people = 0
+    pending_items = 0
     pending_reason_people: dict[str, int] = {}
     pending_reason_items: dict[str, int] = {}
+    pending_lines: list[str] = []
+    blocked_lines: list[str] = []
+    # One pass over people gathers the counts and both detail sections.
     for person in people:
+        if person.blocked:
+            blocked += 1
+            codes = person.blocking_codes or ["UNKNOWN"]
+            blocked_lines.append(f"- {person.name}: {','.join(codes)}")
+        pending_items += person.pending_count
+        if person.pending_count > 0:
+            pending_people += 1
+            pending_lines.append(f"- {person.name}: {person.pending_count}条")
         for reason, count in person.pending_summary.items():
             if count <= 0:
                 continue
             pending_reason_people[reason] = pending_reason_people.get(reason, 0) + 1
             pending_reason_items[reason] = pending_reason_items.get(reason, 0) + count
+    success = total - blocked
     if total != success + blocked:
         raise ValueError("汇总人数不一致")
 
@@ -139,41 +148,21 @@ def _render_summary(
 
     if pending_people:
         lines.append("待确认原因汇总：")
-        reason_order = [
-            "状态缺失",
-            "通过但状态缺失",
-            "未通过",
-            "状态无效",
-            "类别待确认",
-            "金额缺失",
+        known = [
+            reason for reason in PENDING_REASON_ORDER if reason in pending_reason_items
         ]
-        for reason in reason_order:
-            if reason not in pending_reason_items:
-                continue
-            lines.append(
-                f"- {reason}：人数{pending_reason_people.get(reason, 0)}｜条数"
-                f"{pending_reason_items[reason]}"
-            )
-        for reason in sorted(pending_reason_items):
-            if reason in reason_order:
-                continue
+        extra = sorted(pending_reason_items.keys() - PENDING_REASON_ORDER)
+        for reason in known + extra:
             lines.append(
                 f"- {reason}：人数{pending_reason_people.get(reason, 0)}｜条数"
                 f"{pending_reason_items[reason]}"
             )
         lines.append("待确认明细：")
-        for person in people:
-            if person.pending_count <= 0:
-                continue
-            lines.append(f"- {person.name}: {person.pending_count}条")
+        lines.extend(pending_lines)
 
     if blocked:
         lines.append("阻断原因列表：")
-        for person in people:
-            if not person.blocked:
-                continue
-            codes = person.blocking_codes or ["UNKNOWN"]
-            lines.append(f"- {person.name}: {','.join(codes)}")
+        lines.extend(blocked_lines)
 
     if fixed_rate_hits:
         lines.append("固定日薪命中：")
@@ -189,29 +178,48 @@ def _render_summary(
 
 
 def settle_project(
-    attendance_rows: Iterable[dict[str, str]],
-    payment_rows: Iterable[dict[str, str]],
+    attendance_rows: Iterable[Mapping[str, str]],
+    payment_rows: Iterable[Mapping[str, str]],
     *,
-    command: dict[str, object],
+    command: Command,
     project_name: str,
     output_dir: Path,
     runtime_overrides: dict[str, object],
+    writer: Callable[[Path, str], None] | None = None,
+    max_workers: int | None = 1,
 ) -> Path:
+    """Settle every project member and write payslips plus a summary index.
+
+    ``writer`` receives each output path and text; it defaults to writing
+    UTF-8 files under ``output_dir``. ``max_workers`` is passed to
+    :func:`settle_people`; people are settled in this process unless a
+    caller opts into a worker pool, and all writes stay in this process.
+    """
+    write = writer or _write_text
     attendance_list = list(attendance_rows)
     payment_list = list(payment_rows)
-    attendance_result = compute_attendance(attendance_list, project_name, None)
+    # Built once: it yields the table roles here and is reused by settlement.
+    attendance_index = build_attendance_index(attendance_list, project_name)
+    attendance_result = compute_attendance(
+        attendance_list, project_name, None, attendance_index
+    )
     table_roles = attendance_result.role_by_person
     people = sorted(
         collect_attendance_people(attendance_list, project_name)
         | collect_payment_people(payment_list, project_name)
     )
 
-    role_overrides = command.get("role_overrides") or {}
-    fixed_daily_rates = command.get("fixed_daily_rates") or {}
+    role_overrides = command.role_overrides or {}
+    fixed_daily_rates = command.fixed_daily_rates or {}
 
     fixed_rate_hits: dict[str, tuple[Decimal, str]] = {}
     role_sources: dict[str, tuple[str, str]] = {}
     person_summaries: list[PersonSummary] = []
+    specs: list[dict[str, object]] = []
+    # Shared by every person; each spec only layers its own daily rate on top.
+    project_runtime = dict(runtime_overrides)
+    project_runtime["fixed_daily_rates"] = fixed_daily_rates
+    project_runtime["require_project_ended"] = 1
 
     for name in people:
         role, role_source = _resolve_role(name, table_roles, role_overrides)
@@ -225,36 +233,38 @@ def settle_project(
         if rate_source in {"口令", "系统"}:
             fixed_rate_hits[name] = (daily_rate, rate_source)
 
-        per_runtime = dict(runtime_overrides)
-        per_runtime["daily_group"] = str(daily_rate)
-        per_runtime["fixed_daily_rates"] = fixed_daily_rates
-        per_runtime["require_project_ended"] = 1
+        per_runtime = ChainMap({"daily_group": str(daily_rate)}, project_runtime)
 
-        output_text = settle_person(
-            attendance_list,
-            payment_list,
-            person_name=name,
-            role=role,
-            project_ended=command.get("project_ended"),
-            project_name=project_name,
-            runtime_overrides=per_runtime,
+        specs.append(
+            {
+                "person_name": name,
+                "role": role,
+                "project_ended": command.project_ended,
+                "project_name": project_name,
+                "runtime_overrides": per_runtime,
+            }
         )
-        file_path = output_dir / f"工资单_{name}.txt"
-        file_path.write_text(output_text, encoding="utf-8")
 
-        blocked = output_text.startswith("【阻断｜工资结算】")
-        log_path = _extract_log_path(output_text)
-        pending_summary = _load_pending_summary(log_path)
-        pending_count = sum(pending_summary.values())
+    # One batch shares the row scans across everyone in the project.
+    results = settle_people_results(
+        attendance_list,
+        payment_list,
+        specs,
+        max_workers=max_workers,
+        attendance_index=attendance_index,
+    )
+    for name, result in zip(people, results):
+        file_path = output_dir / f"工资单_{name}.txt"
+        write(file_path, result.output_text)
         person_summaries.append(
             PersonSummary(
                 name=name,
-                output_text=output_text,
-                blocked=blocked,
-                pending_count=pending_count,
-                pending_summary=pending_summary,
-                blocking_codes=_parse_blocking_codes(output_text) if blocked else [],
-                log_path=log_path,
+                output_text=result.output_text,
+                blocked=result.blocked,
+                pending_count=sum(result.pending_summary.values()),
+                pending_summary=result.pending_summary,
+                blocking_codes=result.blocking_codes,
+                log_path=result.log_path,
             )
         )
 
@@ -265,7 +275,7 @@ def settle_project(
         role_sources,
     )
     summary_path = output_dir / "汇总索引.txt"
-    summary_path.write_text(summary_text, encoding="utf-8")
+    write(summary_path, summary_text)
     return summary_path
 
 
@@ -280,7 +290,7 @@ def main() -> int:
         return 0
 
     command = parse_command(command_text)
-    if command.get("mode") != "project":
+    if command.mode != "project":
         print("口令非项目结算模式，请使用工资：开头或切换到项目结算：")
         return 0
 
@@ -288,14 +298,13 @@ def main() -> int:
     if selected is None:
         return 0
 
-    attendance_rows = demo_settle_person._read_csv(selected[0])
-    payment_rows = demo_settle_person._read_csv(selected[1])
+    attendance_rows, payment_rows = demo_settle_person._read_input_rows(selected)
 
-    runtime_overrides = dict(command.get("runtime_overrides") or {})
-    project_name = command.get("project_name")
+    runtime_overrides = dict(command.runtime_overrides or {})
+    project_name = command.project_name
     if not project_name:
         project_name = demo_settle_person._derive_project_name(selected[0])
-        command["project_name"] = project_name
+        command = replace(command, project_name=project_name)
         if project_name:
             runtime_overrides["project_name_source"] = "derived"
             demo_settle_person._append_audit_note(
@@ -1,14 +1,22 @@
 """工资出单状态盘点/自检报告工具."""
 from __future__ import annotations
 
-import csv
-import re
+import os
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
 
 from wage.ruleset import get_ruleset_version
 
+from ._csv_io import (
+    clean_header,
+    count_keywords,
+    join_headers,
+    read_headers,
+    scan_map,
+    summarize_headers,
+)
+
 ATTENDANCE_KEYWORDS = [
     "施工日期",
     "是否施工",
@@ -36,76 +44,73 @@ ONLY_MODE_HINTS = ["ONLY", "极简", "00_出勤", "99_报销"]
 PROJECT_POOL_HINTS = ["2026年-项目池_施工表", "2026年-项目池_报销表"]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CsvCandidate:
     path: Path
     attendance_score: int
     payment_score: int
     cleaned_headers: list[str]
+    size: int
+
+
+GIT_UNAVAILABLE = "(无法获取)"
 
 
 def _run_git(args: list[str]) -> str:
     try:
         output = subprocess.check_output(["git", *args], text=True)
     except (subprocess.CalledProcessError, FileNotFoundError):
-        return "(无法获取)"
+        return GIT_UNAVAILABLE
     return output.strip()
 
 
-def _resolve_repo_root() -> Path:
-    return Path(__file__).resolve().parents[1]
-
-
-def _clean_header(text: str) -> str:
-    cleaned = (
-        text.replace("\ufeff", "")
-        .replace("（", "(")
-        .replace("）", ")")
-        .replace("　", " ")
-    )
-    cleaned = re.sub(r"\s+", " ", cleaned.strip())
-    return cleaned
-
+def _parse_branch_status(output: str) -> tuple[str, bool]:
+    """Return ``(branch, dirty)`` from ``git status -b --porcelain=v2`` output.
 
-def _read_headers(path: Path) -> list[str]:
-    with path.open("r", encoding="utf-8-sig") as handle:
-        reader = csv.reader(handle)
-        return next(reader, [])
+    Mirrors ``rev-parse --abbrev-ref HEAD`` (``HEAD`` when detached) and
+    ``status --porcelain`` being non-empty; a failed call counts as dirty.
+    """
+    if output == GIT_UNAVAILABLE:
+        return GIT_UNAVAILABLE, True
+    branch = GIT_UNAVAILABLE
+    dirty = False
+    for line in output.splitlines():
+        if line.startswith("# branch.head "):
+            branch = line[len("# branch.head ") :]
+            if branch == "(detached)":
+                branch = "HEAD"
+        elif line and not line.startswith("#"):
+            dirty = True
+    return branch, dirty
 
 
-def _score_headers(headers: list[str], keywords: list[str]) -> int:
-    hits: set[str] = set()
-    for header in headers:
-        for keyword in keywords:
-            if keyword in header:
-                hits.add(keyword)
-    return len(hits)
+def _resolve_repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
 
 
-def _detect_table_role(path: Path) -> CsvCandidate:
-    headers = [_clean_header(item) for item in _read_headers(path)]
+def _detect_table_role(path: Path, stat_result: os.stat_result) -> CsvCandidate:
+    headers = [clean_header(item) for item in read_headers(path)]
+    header_blob = join_headers(headers)
     return CsvCandidate(
         path=path,
-        attendance_score=_score_headers(headers, ATTENDANCE_KEYWORDS),
-        payment_score=_score_headers(headers, PAYMENT_KEYWORDS),
+        attendance_score=count_keywords(header_blob, ATTENDANCE_KEYWORDS),
+        payment_score=count_keywords(header_blob, PAYMENT_KEYWORDS),
         cleaned_headers=headers,
+        size=stat_result.st_size,
     )
 
 
-def _summarize_headers(headers: list[str], limit: int = 30) -> str:
-    if not headers:
-        return "(空表头)"
-    if len(headers) <= limit:
-        return "｜".join(headers)
-    return "｜".join(headers[:limit]) + f"...(共{len(headers)}列)"
-
-
 def _scan_csv_candidates(data_dir: Path) -> list[CsvCandidate]:
-    candidates: list[CsvCandidate] = []
-    for path in sorted(data_dir.iterdir()):
-        if path.is_file() and path.suffix.lower() == ".csv":
-            candidates.append(_detect_table_role(path))
-    return candidates
+    # DirEntry reuses the file type from the directory read; only CSV names
+    # are stat'ed, once, for the reported size.
+    with os.scandir(data_dir) as entries:
+        found = [
+            (Path(entry.path), entry.stat())
+            for entry in entries
+            if os.path.splitext(entry.name)[1].lower() == ".csv" and entry.is_file()
+        ]
+    found.sort(key=lambda item: item[0])
+    return scan_map(lambda item: _detect_table_role(*item), found)
 
 
 def _select_input_paths(
@@ -126,18 +131,15 @@ def _select_input_paths(
         return None
 
     if len(candidates) == 2:
-        attendance_sorted = sorted(
+        # max() keeps the first of equal keys, like the head of a stable sort.
+        attendance_best = max(
             candidates,
             key=lambda candidate: candidate.attendance_score - candidate.payment_score,
-            reverse=True,
         )
-        payment_sorted = sorted(
+        payment_best = max(
             candidates,
             key=lambda candidate: candidate.payment_score - candidate.attendance_score,
-            reverse=True,
         )
-        attendance_best = attendance_sorted[0]
-        payment_best = payment_sorted[0]
         attendance_delta = attendance_best.attendance_score - attendance_best.payment_score
         payment_delta = payment_best.payment_score - payment_best.attendance_score
         if (
@@ -148,32 +150,22 @@ def _select_input_paths(
             return attendance_best, payment_best
         return None
 
-    attendance_sorted = sorted(
-        candidates,
-        key=lambda candidate: candidate.attendance_score,
-        reverse=True,
-    )
-    payment_sorted = sorted(
-        candidates,
-        key=lambda candidate: candidate.payment_score,
-        reverse=True,
-    )
-
-    attendance_best = attendance_sorted[0]
-    payment_best = payment_sorted[0]
+    attendance_best = max(candidates, key=lambda candidate: candidate.attendance_score)
+    payment_best = max(candidates, key=lambda candidate: candidate.payment_score)
 
     if attendance_best.attendance_score < 2 or payment_best.payment_score < 2:
         return None
 
-    if len(attendance_sorted) > 1:
-        runner_up = attendance_sorted[1]
-        if runner_up.attendance_score == attendance_best.attendance_score:
-            return None
-
-    if len(payment_sorted) > 1:
-        runner_up = payment_sorted[1]
-        if runner_up.payment_score == payment_best.payment_score:
-            return None
+    # A shared top score means there is no unique pick.
+    attendance_ties = sum(
+        candidate.attendance_score == attendance_best.attendance_score
+        for candidate in candidates
+    )
+    payment_ties = sum(
+        candidate.payment_score == payment_best.payment_score for candidate in candidates
+    )
+    if attendance_ties > 1 or payment_ties > 1:
+        return None
 
     return attendance_best, payment_best
 
@@ -211,36 +203,35 @@ def _resolve_mode(
     return "未知/需确认", "未命中 ONLY/项目池/合并表判定规则"
 
 
-def _print_csv_scan(candidates: list[CsvCandidate]) -> None:
+def _csv_scan_lines(candidates: list[CsvCandidate]) -> list[str]:
     if not candidates:
-        print("- CSV列表: 无")
-        return
-    print("- CSV列表:")
+        return ["- CSV列表: 无"]
+    lines = ["- CSV列表:"]
     for candidate in candidates:
-        size = candidate.path.stat().st_size
-        headers = _summarize_headers(candidate.cleaned_headers)
-        print(f"  * 文件名: {candidate.path.name}")
-        print(f"    大小: {size} bytes")
-        print(f"    表头(前30列): {headers}")
-        print(
+        headers = summarize_headers(candidate.cleaned_headers)
+        lines.append(f"  * 文件名: {candidate.path.name}")
+        lines.append(f"    大小: {candidate.size} bytes")
+        lines.append(f"    表头(前30列): {headers}")
+        lines.append(
             "    锚点命中: "
             f"出勤 {candidate.attendance_score}, "
             f"报销 {candidate.payment_score}"
         )
+    return lines
 
 
-def _print_selection_audit(
+def _selection_audit_lines(
     candidates: list[CsvCandidate],
     selected: tuple[CsvCandidate, CsvCandidate] | None,
-) -> None:
-    print("选表审计：")
+) -> list[str]:
+    lines = ["选表审计："]
     if not candidates:
-        print("- 当前无CSV候选，无法选表")
-        return
+        lines.append("- 当前无CSV候选，无法选表")
+        return lines
     for candidate in sorted(candidates, key=lambda item: item.path.name):
         attendance_delta = candidate.attendance_score - candidate.payment_score
         payment_delta = candidate.payment_score - candidate.attendance_score
-        print(
+        lines.append(
             "- 候选: "
             f"{candidate.path.name} | "
             f"出勤命中 {candidate.attendance_score}, "
@@ -249,11 +240,12 @@ def _print_selection_audit(
             f"报销-出勤 {payment_delta}"
         )
     if selected is None:
-        print("- 选表结果: 阻断")
-        print("- 阻断原因: 选表歧义或命中不足，请只保留 1 出勤 + 1 报销或 1 合并表")
-        return
+        lines.append("- 选表结果: 阻断")
+        lines.append("- 阻断原因: 选表歧义或命中不足，请只保留 1 出勤 + 1 报销或 1 合并表")
+        return lines
     attendance, payment = selected
-    print(f"- 选表结果: 出勤表={attendance.path.name} ｜ 报销表={payment.path.name}")
+    lines.append(f"- 选表结果: 出勤表={attendance.path.name} ｜ 报销表={payment.path.name}")
+    return lines
 
 
 def main() -> int:
@@ -261,59 +253,63 @@ def main() -> int:
     data_dir = repo_root / "data"
     current_dir = data_dir / "当前"
 
-    print("工资出单状态盘点/自检报告")
+    # The report is collected and written with a single print at the end.
+    lines = ["工资出单状态盘点/自检报告"]
 
-    branch = _run_git(["rev-parse", "--abbrev-ref", "HEAD"])
-    latest_commit = _run_git(["log", "-1", "--oneline"])
-    dirty = _run_git(["status", "--porcelain"]) != ""
+    # Two git processes: branch and dirty state from one status call, the
+    # latest commit from the head of the 20-entry log.
+    branch, dirty = _parse_branch_status(
+        _run_git(["status", "--branch", "--porcelain=v2"])
+    )
+    log_output = _run_git(["log", "-20", "--oneline"])
+    latest_commit = log_output.split("\n", 1)[0]
 
-    print("一、当前代码版本")
-    print(f"- 最近1个commit: {latest_commit}")
-    print(f"- 分支名: {branch}")
-    print(f"- 是否dirty: {'是' if dirty else '否'}")
+    lines.append("一、当前代码版本")
+    lines.append(f"- 最近1个commit: {latest_commit}")
+    lines.append(f"- 分支名: {branch}")
+    lines.append(f"- 是否dirty: {'是' if dirty else '否'}")
 
-    print("二、规则版本号")
+    lines.append("二、规则版本号")
     try:
         rules_version = get_ruleset_version()
     except (FileNotFoundError, ValueError):
         rules_version = "未知"
-    print(f"- 计算口径版本: {rules_version}")
+    lines.append(f"- 计算口径版本: {rules_version}")
 
-    print("三、最近20条提交摘要")
-    log_output = _run_git(["log", "-20", "--oneline"])
-    if log_output == "(无法获取)":
-        print("- (无法获取)")
+    lines.append("三、最近20条提交摘要")
+    if log_output == GIT_UNAVAILABLE:
+        lines.append("- (无法获取)")
     else:
-        for line in log_output.splitlines():
-            print(f"- {line}")
+        lines.extend(f"- {entry}" for entry in log_output.splitlines())
 
-    print("四、数据目录扫描结果")
+    lines.append("四、数据目录扫描结果")
     if current_dir.exists():
         if current_dir.is_symlink():
             resolved = current_dir.resolve()
-            print(f"- data/当前(软链接→真实路径): {resolved}")
+            lines.append(f"- data/当前(软链接→真实路径): {resolved}")
         else:
-            print(f"- data/当前: {current_dir}")
+            lines.append(f"- data/当前: {current_dir}")
         scan_dir = current_dir
     else:
-        print("- data/当前: (不存在)")
+        lines.append("- data/当前: (不存在)")
         scan_dir = current_dir
 
     command_file = scan_dir / "口令.txt"
-    print(f"- 口令.txt: {'存在' if command_file.exists() else '不存在'}")
+    lines.append(f"- 口令.txt: {'存在' if command_file.exists() else '不存在'}")
 
     candidates = _scan_csv_candidates(scan_dir) if scan_dir.exists() else []
-    _print_csv_scan(candidates)
+    lines.extend(_csv_scan_lines(candidates))
 
     selected = _select_input_paths(candidates)
-    print("五、运行模式判定")
+    lines.append("五、运行模式判定")
     mode, reason = _resolve_mode(candidates, selected)
-    print(f"- 模式: {mode}")
-    print(f"- 依据: {reason}")
+    lines.append(f"- 模式: {mode}")
+    lines.append(f"- 依据: {reason}")
 
-    print("六、选表审计")
-    _print_selection_audit(candidates, selected)
+    lines.append("六、选表审计")
+    lines.extend(_selection_audit_lines(candidates, selected))
 
+    print("\n".join(lines))
     return 0
 
 
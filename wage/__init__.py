@@ -1,5 +1,5 @@
 """Wage settlement package."""
 
-from .settle_person import settle_person
+from .settle_person import settle_people, settle_people_results, settle_person
 
-__all__ = ["settle_person"]
+__all__ = ["settle_people", "settle_people_results", "settle_person"]
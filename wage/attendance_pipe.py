@@ -2,11 +2,14 @@
 from __future__ import annotations
 
 import re
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Iterable, Mapping
+from functools import lru_cache
+from typing import Callable, Iterable, Mapping
 
-from .name_utils import name_key
+from .io import collect_headers
+from .name_utils import name_key, split_name_tokens
 DATE_HEADERS = ["日期", "施工日期", "工作日期", "出勤日期"]
 NAME_HEADERS = [
     "姓名",
@@ -18,6 +21,12 @@ NAME_HEADERS = [
 ]
 WORK_HEADERS = ["是否施工", "出勤", "施工", "今天是否施工", "是否施工?", "是否施工？"]
 VEHICLE_HEADERS = ["车辆", "车辆信息", "车牌"]
+# Date separators written as "-"; "日" only ends a date and is dropped.
+_DATE_TRANSLATION = str.maketrans({"年": "-", "月": "-", "日": None, "/": "-", ".": "-"})
+# Already-ISO dates (the common case) are validated without strptime.
+_ISO_DATE_RE = re.compile(r"([0-9]{4})-([0-9]{2})-([0-9]{2})")
+# Trailing role/affiliation annotation such as "张三(组长)" or "李四（外协）".
+_NAME_SUFFIX_RE = re.compile(r"^(.*?)\s*[\(（][^()（）]+[\)）]\s*$")
 PROJECT_HEADERS = ["项目", "项目名称"]
 ROLE_HEADERS = ["角色", "职务", "岗位"]
 MODE_HEADERS = ["出勤模式", "出勤模式（填表用）", "配置出勤模式（引用）"]
@@ -33,6 +42,12 @@ ROSTER_HEADERS = [
     "辅助2(固定)",
     "辅助2（固定）",
 ]
+DATE_SET_KEYS = {
+    ("单防撞", True): "单防撞｜出勤",
+    ("单防撞", False): "单防撞｜未出勤",
+    ("全组", True): "全组｜出勤",
+    ("全组", False): "全组｜未出勤",
+}
 PAYMENT_ANCHOR_TOKENS = [
     "报销类型",
     "费用类型",
@@ -77,22 +92,52 @@ class AttendanceResult:
     role_by_person: dict[str, str]
 
 
+@dataclass(frozen=True)
+class AttendanceIndex:
+    project_name: str | None
+    days_by_person: dict[str, dict[str, bool]]
+    mode_by_date: dict[str, str]
+    missing_fields: list[str]
+    invalid_dates: list[str]
+    invalid_work_values: list[str]
+    project_mismatches: list[str]
+    project_candidates: list[str]
+    conflict_logs: list[str]
+    normalization_logs: list[str]
+    has_vehicle_field: bool
+    has_explicit_mode: bool
+    fangzhuang_hits: list[str]
+    auto_corrections: list[str]
+    role_by_person: dict[str, str]
+
+
 def _find_header(headers: set[str], candidates: list[str]) -> str | None:
     for candidate in candidates:
         if candidate in headers:
-            return candidate
+            # CSV rows from wage.io carry interned keys; returning the interned
+            # candidate lets per-row lookups match keys by identity.
+            return sys.intern(candidate)
     return None
 
 
+# The row normalizers below are pure and see the same few cell values on
+# every row (one date per day, a handful of names and yes/no spellings).
+@lru_cache(maxsize=4096)
 def _parse_date(value: str) -> tuple[str | None, str | None]:
     raw = value.strip()
     if not raw:
         return None, None
-    normalized = raw
-    normalized = normalized.replace("年", "-").replace("月", "-").replace("日", "")
-    normalized = normalized.replace("/", "-").replace(".", "-")
+    normalized = raw.translate(_DATE_TRANSLATION)
     normalized = "-".join(part for part in normalized.split("-") if part)
-    for fmt in ("%Y-%m-%d", "%Y-%m-%d", "%Y%m%d"):
+    match = _ISO_DATE_RE.fullmatch(normalized)
+    if match and match[1] >= "1000":
+        try:
+            datetime(int(match[1]), int(match[2]), int(match[3]))
+        except ValueError:
+            pass
+        else:
+            return normalized, (raw if normalized != raw else None)
+    for fmt in ("%Y-%m-%d", "%Y%m%d"):
         try:
             parsed = datetime.strptime(normalized, fmt)
         except ValueError:
@@ -112,6 +157,7 @@ def _find_payment_anchor_headers(headers: set[str]) -> list[str]:
     ]
 
 
+@lru_cache(maxsize=1024)
 def _normalize_role(value: str) -> str | None:
     text = value.strip()
     if not text:
@@ -123,6 +169,7 @@ def _normalize_role(value: str) -> str | None:
     return None
 
 
+@lru_cache(maxsize=1024)
 def _normalize_work_value(value: str) -> tuple[bool | None, str | None]:
     raw = value.strip()
     if not raw:
@@ -135,41 +182,46 @@ def _normalize_work_value(value: str) -> tuple[bool | None, str | None]:
     return None, None
 
 
+@lru_cache(maxsize=4096)
 def _normalize_person_name(value: str) -> str:
     cleaned = value.strip()
     if not cleaned:
         return cleaned
-    match = re.match(r"^(.*?)\s*[\(（][^()（）]+[\)）]\s*$", cleaned)
+    match = _NAME_SUFFIX_RE.match(cleaned)
     if match:
         return match.group(1).strip()
     return cleaned
 
 
+def _cell_reader(key: str | None) -> Callable[[Mapping[str, str]], str]:
+    """Return a reader for a column's stripped cell; a missing column reads ""."""
+    if key is None:
+        return lambda row: ""
+    return lambda row: row.get(key, "").strip()
+
+
 def _split_names(raw: str) -> list[str]:
     cleaned = raw.strip()
     if not cleaned:
         return []
-    parts = [part for part in re.split(r"[、，,;；\s]+", cleaned) if part]
+    parts = split_name_tokens(cleaned)
     if not parts:
         return [_normalize_person_name(cleaned)]
-    seen: set[str] = set()
-    deduped: list[str] = []
-    for part in parts:
-        normalized = _normalize_person_name(part)
-        if normalized and normalized not in seen:
-            seen.add(normalized)
-            deduped.append(normalized)
-    return deduped
+    if len(parts) == 1:
+        # Most cells name a single person; skip the dedupe bookkeeping.
+        normalized = _normalize_person_name(parts[0])
+        return [normalized] if normalized else []
+    return list(dict.fromkeys(filter(None, map(_normalize_person_name, parts))))
 
 
 def _split_display_names(raw: str) -> list[str]:
     cleaned = raw.strip()
     if not cleaned:
         return []
-    parts = [part for part in re.split(r"[、，,;；\s]+", cleaned) if part]
+    parts = split_name_tokens(cleaned)
     if not parts:
         return [cleaned]
-    return [part.strip() for part in parts if part.strip()]
+    return parts
 
 
 def _collect_row_names(
@@ -181,11 +233,11 @@ def _collect_row_names(
     primary_value = row.get(name_key, "").strip() if name_key else ""
     if primary_value:
         names = _split_names(primary_value)
-        for raw_part in re.split(r"[、，,;；\s]+", primary_value.strip()):
+        for raw_part in split_name_tokens(primary_value):
             normalized = _normalize_person_name(raw_part)
-            if normalized and normalized != raw_part.strip():
+            if normalized and normalized != raw_part:
                 normalization_logs.append(
-                    f"姓名规范化: '{raw_part.strip()}' -> '{normalized}'"
+                    f"姓名规范化: '{raw_part}' -> '{normalized}'"
                 )
         return names, primary_value
     roster_values = [
@@ -196,11 +248,11 @@ def _collect_row_names(
     names: list[str] = []
     seen: set[str] = set()
     for value in roster_values:
-        for raw_part in re.split(r"[、，,;；\s]+", value.strip()):
+        for raw_part in split_name_tokens(value):
             normalized = _normalize_person_name(raw_part)
-            if normalized and normalized != raw_part.strip():
+            if normalized and normalized != raw_part:
                 normalization_logs.append(
-                    f"姓名规范化: '{raw_part.strip()}' -> '{normalized}'"
+                    f"姓名规范化: '{raw_part}' -> '{normalized}'"
                 )
             if normalized and normalized not in seen:
                 seen.add(normalized)
@@ -208,13 +260,13 @@ def _collect_row_names(
     return names, ""
 
 
-def compute_attendance(
+def build_attendance_index(
     attendance_rows: Iterable[Mapping[str, str]],
     project_name: str | None,
-    target_person: str | None,
-) -> AttendanceResult:
+) -> AttendanceIndex:
+    """Scan attendance rows once for a project, independent of any person."""
     rows = list(attendance_rows)
-    headers = {key.strip() for row in rows for key in row.keys()}
+    headers = collect_headers(rows)
     date_key = _find_header(headers, DATE_HEADERS)
     name_key = _find_header(headers, NAME_HEADERS)
     work_key = _find_header(headers, WORK_HEADERS)
@@ -251,23 +303,28 @@ def compute_attendance(
     fangzhuang_hits: list[str] = []
     role_by_person: dict[str, str] = {}
 
-    person_day_status: dict[tuple[str, str], bool] = {}
-    day_people_working: dict[str, set[str]] = {}
-    day_people_any: dict[str, set[str]] = {}
+    days_by_person: dict[str, dict[str, bool]] = {}
+    # Only the number of people working each day is needed, not who they are.
+    day_working_count: dict[str, int] = {}
+    all_dates: set[str] = set()
     explicit_mode_by_date: dict[str, str] = {}
 
-    normalized_target = _normalize_person_name(target_person or "")
-    for index, row in enumerate(rows, start=1):
-        if date_key is None or name_key is None or work_key is None:
-            continue
+    # Column presence is settled once here instead of on every row.
+    read_project = _cell_reader(project_key)
+    read_vehicle = _cell_reader(vehicle_key)
+    read_role = _cell_reader(role_key)
+    read_mode = _cell_reader(mode_key)
+
+    # Without date, name and work columns no row can contribute a day.
+    scan_rows = rows if None not in (date_key, name_key, work_key) else []
+    for index, row in enumerate(scan_rows, start=1):
         work_value = row.get(work_key, "")
         if not work_value.strip() and payment_anchor_keys:
             if any(row.get(key, "").strip() for key in payment_anchor_keys):
                 continue
-        if project_key:
-            raw_project = row.get(project_key, "").strip()
-            if raw_project:
-                project_values.add(raw_project)
+        raw_project = read_project(row)
+        if raw_project:
+            project_values.add(raw_project)
         date_value = row.get(date_key, "")
         parsed_date, raw_date = _parse_date(date_value)
         if parsed_date is None:
@@ -295,10 +352,9 @@ def compute_attendance(
             normalization_logs.append(
                 f"是否施工归一: '{work_value.strip()}' -> '{normalized_work}'"
             )
-        vehicle_value = row.get(vehicle_key, "").strip() if vehicle_key else ""
-        role_value = row.get(role_key, "").strip() if role_key else ""
-        normalized_role = _normalize_role(role_value)
-        mode_value = row.get(mode_key, "").strip() if mode_key else ""
+        vehicle_value = read_vehicle(row)
+        normalized_role = _normalize_role(read_role(row))
+        mode_value = read_mode(row)
         if mode_value:
             mode_label = "单防撞" if "单防撞" in mode_value else "全组"
             existing_mode = explicit_mode_by_date.get(parsed_date)
@@ -307,7 +363,6 @@ def compute_attendance(
         if vehicle_value and "防撞" in vehicle_value:
             for name in name_list:
                 fangzhuang_hits.append(f"{name}@{parsed_date}:{vehicle_value}")
-        raw_project = row.get(project_key, "").strip() if project_key else ""
         if project_name and raw_project and raw_project != project_name:
             for name in name_list:
                 project_mismatches.append(f"{name}@{parsed_date}: {raw_project}")
@@ -329,35 +384,36 @@ def compute_attendance(
                 else:
                     role_by_person[name] = normalized_role
 
-            key = (name, parsed_date)
-            if key in person_day_status:
-                if person_day_status[key] is False and is_work is True:
-                    person_day_status[key] = True
+            person_days = days_by_person.setdefault(name, {})
+            if parsed_date in person_days:
+                if person_days[parsed_date] is False and is_work is True:
+                    person_days[parsed_date] = True
                     conflict_logs.append(
                         f"同日冲突: {name} {parsed_date} 未施工->施工 (施工优先)"
                     )
                     auto_corrections.append(
                         f"冲突消解: {name} {parsed_date} 按施工优先"
                     )
-                elif person_day_status[key] is True and is_work is False:
+                elif person_days[parsed_date] is True and is_work is False:
                     conflict_logs.append(
                         f"同日冲突: {name} {parsed_date} 施工保持"
                     )
                 continue
-            person_day_status[key] = is_work
+            person_days[parsed_date] = is_work
 
-            day_people_any.setdefault(parsed_date, set()).add(name)
+            all_dates.add(parsed_date)
             if is_work:
-                day_people_working.setdefault(parsed_date, set()).add(name)
+                day_working_count[parsed_date] = (
+                    day_working_count.get(parsed_date, 0) + 1
+                )
 
     mode_by_date: dict[str, str] = {}
-    for date in sorted(day_people_any.keys()):
+    for date in sorted(all_dates):
         explicit_mode = explicit_mode_by_date.get(date)
         if explicit_mode:
             mode = explicit_mode
         else:
-            working = day_people_working.get(date, set())
-            count = len(working)
+            count = day_working_count.get(date, 0)
             if 1 <= count <= 2:
                 mode = "单防撞"
             elif count >= 3:
@@ -366,40 +422,9 @@ def compute_attendance(
                 mode = "全组"
         mode_by_date[date] = mode
 
-    date_sets = {
-        "单防撞｜出勤": [],
-        "单防撞｜未出勤": [],
-        "全组｜出勤": [],
-        "全组｜未出勤": [],
-    }
-
-    if target_person:
-        person_dates = sorted(
-            {
-                date
-                for (name, date), _ in person_day_status.items()
-                if name == normalized_target
-            }
-        )
-        for date in person_dates:
-            mode = mode_by_date.get(date, "全组")
-            worked = person_day_status[(normalized_target, date)]
-            if mode == "单防撞":
-                if worked:
-                    date_sets["单防撞｜出勤"].append(date)
-                else:
-                    date_sets["单防撞｜未出勤"].append(date)
-            else:
-                if worked:
-                    date_sets["全组｜出勤"].append(date)
-                else:
-                    date_sets["全组｜未出勤"].append(date)
-
-    for key in list(date_sets.keys()):
-        date_sets[key] = sorted(set(date_sets[key]))
-
-    return AttendanceResult(
-        date_sets=date_sets,
+    return AttendanceIndex(
+        project_name=project_name,
+        days_by_person=days_by_person,
         mode_by_date=mode_by_date,
         missing_fields=missing_fields,
         invalid_dates=invalid_dates,
@@ -416,29 +441,75 @@ def compute_attendance(
     )
 
 
+def compute_attendance(
+    attendance_rows: Iterable[Mapping[str, str]],
+    project_name: str | None,
+    target_person: str | None,
+    index: AttendanceIndex | None = None,
+) -> AttendanceResult:
+    """Compute attendance date sets for ``target_person``.
+
+    ``index`` may be a prebuilt :func:`build_attendance_index` for the same rows
+    and project; it lets callers settle many people without rescanning rows.
+    """
+    if index is None:
+        index = build_attendance_index(attendance_rows, project_name)
+    elif index.project_name != project_name:
+        raise ValueError("attendance index was built for a different project")
+
+    date_sets: dict[str, list[str]] = {key: [] for key in DATE_SET_KEYS.values()}
+
+    if target_person:
+        normalized_target = _normalize_person_name(target_person)
+        person_days = index.days_by_person.get(normalized_target, {})
+        mode_by_date = index.mode_by_date
+        # Dates are unique per person, so appending in sorted order keeps
+        # every list sorted and duplicate-free.
+        for date in sorted(person_days):
+            mode = mode_by_date.get(date, "全组")
+            date_sets[DATE_SET_KEYS[mode, person_days[date]]].append(date)
+
+    return AttendanceResult(
+        date_sets=date_sets,
+        mode_by_date=dict(index.mode_by_date),
+        missing_fields=list(index.missing_fields),
+        invalid_dates=list(index.invalid_dates),
+        invalid_work_values=list(index.invalid_work_values),
+        project_mismatches=list(index.project_mismatches),
+        project_candidates=list(index.project_candidates),
+        conflict_logs=list(index.conflict_logs),
+        normalization_logs=list(index.normalization_logs),
+        has_vehicle_field=index.has_vehicle_field,
+        has_explicit_mode=index.has_explicit_mode,
+        fangzhuang_hits=list(index.fangzhuang_hits),
+        auto_corrections=list(index.auto_corrections),
+        role_by_person=dict(index.role_by_person),
+    )
+
+
 def collect_attendance_people(
     attendance_rows: Iterable[Mapping[str, str]],
     project_name: str | None,
 ) -> set[str]:
     rows = list(attendance_rows)
-    headers = {key.strip() for row in rows for key in row.keys()}
+    headers = collect_headers(rows)
     name_key = _find_header(headers, NAME_HEADERS)
     project_key = _find_header(headers, PROJECT_HEADERS)
     roster_keys = [key for key in ROSTER_HEADERS if key in headers]
     if name_key is None and not roster_keys:
         return set()
     people: set[str] = set()
+    discarded_logs: list[str] = []
     for row in rows:
-        name_list, _ = _collect_row_names(row, name_key, roster_keys, [])
-        if not name_list:
-            continue
-        raw_project = row.get(project_key, "").strip() if project_key else ""
-        if project_name and raw_project and raw_project != project_name:
-            continue
-        for name in name_list:
-            normalized = _normalize_person_name(name)
-            if normalized:
-                people.add(normalized)
+        if project_name and project_key:
+            raw_project = row.get(project_key, "").strip()
+            if raw_project and raw_project != project_name:
+                continue
+        name_list, _ = _collect_row_names(row, name_key, roster_keys, discarded_logs)
+        if name_list:
+            people.update(map(_normalize_person_name, name_list))
+        discarded_logs.clear()
+    people.discard("")
     return people
 
 
@@ -447,7 +518,7 @@ def collect_name_key_conflicts(
     project_name: str | None,
 ) -> list[dict[str, object]]:
     rows = list(attendance_rows)
-    headers = {key.strip() for row in rows for key in row.keys()}
+    headers = collect_headers(rows)
     name_header = _find_header(headers, NAME_HEADERS)
     project_key = _find_header(headers, PROJECT_HEADERS)
     roster_keys = [key for key in ROSTER_HEADERS if key in headers]
@@ -4,10 +4,12 @@ from __future__ import annotations
 import re
 from collections import Counter
 from dataclasses import dataclass, field
+from functools import lru_cache
 from decimal import Decimal, InvalidOperation
 from typing import Any, Iterable, Mapping
 
-from .name_utils import name_key
+from .io import collect_headers
+from .name_utils import name_key, split_name_tokens
 
 ROLE_KEYWORDS = ["组长", "组员"]
 FULLWIDTH_SPACE = "\u3000"
@@ -15,18 +17,29 @@ ROAD_VALUE_MAP = {
     "有": "计算路补",
     "无": "无路补",
 }
+_LINE_TRANSLATION = str.maketrans(
+    {
+        "\ufeff": None,
+        "：": ":",
+        "＝": "=",
+        FULLWIDTH_SPACE: " ",
+        "｜": " ",
+        "|": " ",
+    }
+)
+_CURRENCY_TRANSLATION = str.maketrans(dict.fromkeys("元￥¥"))
+_SECTION_MARKER_RE = re.compile(r"^【[^】]*】$")
+_PERSON_NAME_RE = re.compile(r"工资\s*[:：]\s*([^\s]+)")
+_KV_SEPARATOR_RE = re.compile(r"[:=]")
+_KV_PAIR_RE = re.compile(r"([^\s:=]+)\s*[:=]\s*([^\s]+)")
+_PROJECT_ENDED_KEY_RE = re.compile(r"^(项目已结束|项目结束|项目是否结束)\s*[:=]\s*(\S+)$")
+_PROJECT_KEY_RE = re.compile(r"^项目\s*[:=]\s*(.+)$")
+_LEADER_KEY_RE = re.compile(r"^组长\s*:\s*(.*)$")
+_ROAD_KEY_RE = re.compile(r"^路补\s*=\s*(有|无)\s*:?\s*(.*)$")
 
 
 def _normalize_line(text: str) -> str:
-    cleaned = (
-        text.replace("\ufeff", "")
-        .replace("：", ":")
-        .replace("＝", "=")
-        .replace(FULLWIDTH_SPACE, " ")
-        .replace("｜", " ")
-        .replace("|", " ")
-    )
-    return " ".join(cleaned.strip().split())
+    return " ".join(text.translate(_LINE_TRANSLATION).split())
 
 
 def _is_ignored_line(text: str) -> bool:
@@ -35,7 +48,7 @@ def _is_ignored_line(text: str) -> bool:
         return True
     if stripped.startswith("#"):
         return True
-    if re.match(r"^【[^】]*】$", stripped):
+    if _SECTION_MARKER_RE.match(stripped):
         return True
     return False
 
@@ -72,11 +85,10 @@ def _extract_role(text: str) -> str | None:
 
 
 def _extract_person_name(text: str) -> str | None:
-    match = re.search(r"工资\s*[:：]\s*([^\s]+)", text)
+    match = _PERSON_NAME_RE.search(text)
     if match:
         return match.group(1).strip()
-    tokens = [token for token in re.split(r"\s+", text) if token]
-    for token in tokens:
+    for token in text.split():
         if token in ("工资", "工资:", "工资："):
             continue
         if token in ROLE_KEYWORDS:
@@ -91,7 +103,7 @@ def _extract_person_name(text: str) -> str | None:
 
 def _split_kv(text: str) -> tuple[str | None, str | None]:
     normalized = _normalize_line(text)
-    match = re.search(r"[:=]", normalized)
+    match = _KV_SEPARATOR_RE.search(normalized)
     if not match:
         return None, None
     name, value = normalized.split(match.group(0), 1)
@@ -112,7 +124,7 @@ def _normalize_role(value: str) -> str | None:
 
 
 def _parse_fixed_daily_rate(value: str) -> Decimal | None:
-    cleaned = value.replace("元", "").replace("￥", "").replace("¥", "").strip()
+    cleaned = value.translate(_CURRENCY_TRANSLATION).strip()
     if not cleaned:
         return None
     try:
@@ -132,7 +144,7 @@ def _detect_mode(first_line: str) -> str | None:
 
 def _extract_kv_pairs(line: str) -> list[tuple[str, str]]:
     normalized = _normalize_line(line)
-    return re.findall(r"([^\s:=]+)\s*[:=]\s*([^\s]+)", normalized)
+    return _KV_PAIR_RE.findall(normalized)
 
 
 PROJECT_HEADERS = ["项目", "项目名称", "项目名"]
@@ -154,10 +166,7 @@ class _PassphraseState:
 
 
 def _split_names(raw: str) -> list[str]:
-    cleaned = raw.strip()
-    if not cleaned:
-        return []
-    return [part for part in re.split(r"[、，,;；\s]+", cleaned) if part]
+    return split_name_tokens(raw)
 
 
 def _add_names(
@@ -166,28 +175,30 @@ def _add_names(
     entries: list[tuple[str, str]],
     name_map: dict[str, list[str]],
 ) -> None:
-    seen = {key for key, _ in entries}
+    # ``name_map`` holds exactly the keys already in ``entries``.
     for display in names:
         key = name_key(display)
-        name_map.setdefault(key, []).append(display)
-        if key in seen:
-            continue
-        entries.append((key, display))
-        seen.add(key)
+        displays = name_map.get(key)
+        if displays is None:
+            name_map[key] = [display]
+            entries.append((key, display))
+        else:
+            displays.append(display)
 
 
+@lru_cache(maxsize=2048)
 def _match_passphrase_key(line: str) -> tuple[str, str] | None:
     normalized = _normalize_line(line)
-    match = re.match(r"^(项目已结束|项目结束|项目是否结束)\s*[:=]\s*(\S+)$", normalized)
+    match = _PROJECT_ENDED_KEY_RE.match(normalized)
     if match:
         return "project_ended", match.group(2)
-    match = re.match(r"^项目\s*[:=]\s*(.+)$", normalized)
+    match = _PROJECT_KEY_RE.match(normalized)
     if match:
         return "project", match.group(1).strip()
-    match = re.match(r"^组长\s*:\s*(.*)$", normalized)
+    match = _LEADER_KEY_RE.match(normalized)
     if match:
         return "leader", match.group(1).strip()
-    match = re.match(r"^路补\s*=\s*(有|无)\s*:?\s*(.*)$", normalized)
+    match = _ROAD_KEY_RE.match(normalized)
     if match:
         return ("road_yes" if match.group(1) == "有" else "road_no", match.group(2).strip())
     return None
@@ -195,7 +206,7 @@ def _match_passphrase_key(line: str) -> tuple[str, str] | None:
 
 def _collect_project_counts(rows: Iterable[Mapping[str, str]]) -> Counter:
     rows_list = list(rows)
-    headers = {key.strip() for row in rows_list for key in row.keys()}
+    headers = collect_headers(rows_list)
     project_key = next((header for header in PROJECT_HEADERS if header in headers), None)
     counter: Counter[str] = Counter()
     if not project_key:
@@ -285,12 +296,13 @@ def expand_wage_passphrase_commands(
             errors.append("路补=有/无 两组人员均为空，无法展开工资命令")
             state = None
             return
-        conflict_keys = set(state.road_yes_names).intersection(state.road_no_names)
+        road_no_names = state.road_no_names
+        conflict_keys = [key for key in state.road_yes_names if key in road_no_names]
         if conflict_keys:
-            conflict_display = []
-            for key in conflict_keys:
-                display_names = state.road_yes_names.get(key, []) + state.road_no_names.get(key, [])
-                conflict_display.append("/".join(display_names))
+            conflict_display = [
+                "/".join(state.road_yes_names[key] + road_no_names[key])
+                for key in conflict_keys
+            ]
             errors.append(f"路补名单冲突：{ '、'.join(conflict_display) }")
             state = None
             return
@@ -522,12 +534,37 @@ def _apply_kv_mapping(
         return
 
 
-def parse_command(text: str) -> dict[str, Any]:
-    """Parse wage settlement command text.
+@dataclass(frozen=True, slots=True)
+class Command:
+    """A parsed settlement command.
 
-    Returns a dict with person_name, role, project_ended, project_name,
-    runtime_overrides.
+    Fields are read as attributes; ``command["key"]`` and ``command.get()``
+    remain available for code written against the former dict result. Use
+    :func:`dataclasses.replace` to derive a changed command.
     """
+
+    mode: str
+    person_name: str | None
+    role: str | None
+    project_ended: bool | None
+    project_name: str | None
+    road_cmd: str | None
+    role_overrides: dict[str, str]
+    fixed_daily_rates: dict[str, Decimal]
+    runtime_overrides: dict[str, Any]
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+
+def parse_command(text: str) -> Command:
+    """Parse wage settlement command text."""
     raw_lines = text.splitlines()
     normalized_lines: list[tuple[int, str, str]] = []
     for line_no, raw_line in enumerate(raw_lines, start=1):
@@ -641,4 +678,4 @@ def parse_command(text: str) -> dict[str, Any]:
         )
     if fixed_rate_conflicts:
         result["runtime_overrides"]["name_key_conflicts"] = fixed_rate_conflicts
-    return result
+    return Command(**result)
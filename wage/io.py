@@ -0,0 +1,139 @@
+"""CSV loading helpers for wage settlement."""
+from __future__ import annotations
+
+import csv
+import sys
+from itertools import chain
+from pathlib import Path
+from typing import Iterable, Iterator, KeysView, Mapping
+
+DEFAULT_CHUNKSIZE = 65536
+# Large exports are read in few big syscalls instead of 8 KB ones.
+READ_BUFFER_SIZE = 1 << 20
+# Cells up to this length (dates, names, projects, statuses, flags) repeat
+# heavily across rows and are shared as one string object per read.
+SHARED_VALUE_MAX_LENGTH = 32
+
+
+class CompactRow(Mapping[str, str]):
+    """Read-only CSV row storing its cells in a tuple.
+
+    All rows of one read share a single header-to-position map, so each row
+    only costs a slotted object plus a tuple instead of a full dict.
+    """
+
+    __slots__ = ("_positions", "_values")
+
+    def __init__(self, positions: dict[str, int], values: tuple[str, ...]) -> None:
+        self._positions = positions
+        self._values = values
+
+    def __getitem__(self, key: str) -> str:
+        return self._values[self._positions[key]]
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        position = self._positions.get(key)
+        if position is None:
+            return default
+        return self._values[position]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._positions
+
+    def keys(self) -> KeysView[str]:
+        # The shared map's own view, so comparing two rows' keys stays in C.
+        return self._positions.keys()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._positions)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __repr__(self) -> str:
+        return f"CompactRow({dict(self)!r})"
+
+
+def _shared_values(
+    headers: list[str], values: list[str], shared: dict[str, str]
+) -> list[str]:
+    if len(values) < len(headers):
+        values = values + [""] * (len(headers) - len(values))
+    return [
+        shared.setdefault(value, value)
+        if len(value) <= SHARED_VALUE_MAX_LENGTH
+        else value
+        for value in values
+    ]
+
+
+def _row_dict(
+    headers: list[str], values: list[str], shared: dict[str, str]
+) -> dict[str, str]:
+    return dict(zip(headers, _shared_values(headers, values, shared)))
+
+
+def _compact_row(
+    positions: dict[str, int],
+    headers: list[str],
+    values: list[str],
+    shared: dict[str, str],
+) -> CompactRow:
+    cells = _shared_values(headers, values, shared)
+    return CompactRow(positions, tuple(cells[: len(headers)]))
+
+
+def iter_rows(
+    path: Path, chunksize: int = DEFAULT_CHUNKSIZE, *, compact: bool = False
+) -> Iterator[list[Mapping[str, str]]]:
+    """Yield the data rows of a UTF-8 CSV as lists of at most ``chunksize`` rows.
+
+    Rows are plain dicts unless ``compact`` is set, in which case they are
+    read-only :class:`CompactRow` mappings sharing one header map. Unlike
+    :class:`csv.DictReader`, missing trailing cells read as ``""`` rather than
+    ``None`` and cells beyond the header are dropped, so every value is a string.
+    """
+    if chunksize <= 0:
+        raise ValueError("chunksize must be positive")
+    with path.open(
+        "r", encoding="utf-8-sig", newline="", buffering=READ_BUFFER_SIZE
+    ) as handle:
+        reader = csv.reader(handle)
+        headers = [sys.intern(header) for header in next(reader, [])]
+        shared: dict[str, str] = {}
+        positions = {header: position for position, header in enumerate(headers)}
+        chunk: list[Mapping[str, str]] = []
+        for values in reader:
+            if not values:
+                continue
+            if compact:
+                chunk.append(_compact_row(positions, headers, values, shared))
+            else:
+                chunk.append(_row_dict(headers, values, shared))
+            if len(chunk) >= chunksize:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def collect_headers(rows: Iterable[Mapping[str, str]]) -> set[str]:
+    """Return the stripped keys of all ``rows``.
+
+    Rows read from one table share their keys, so a row is only scanned when
+    its keys differ from those of the row before it.
+    """
+    headers: set[str] = set()
+    previous_keys: KeysView[str] | None = None
+    for row in rows:
+        keys = row.keys()
+        if previous_keys is None or keys != previous_keys:
+            headers.update(key.strip() for key in keys)
+            previous_keys = keys
+    return headers
+
+
+def read_rows(
+    path: Path, chunksize: int = DEFAULT_CHUNKSIZE, *, compact: bool = False
+) -> list[Mapping[str, str]]:
+    return list(chain.from_iterable(iter_rows(path, chunksize, compact=compact)))
@@ -6,13 +6,22 @@ from typing import Mapping, TypeVar
 
 T = TypeVar("T")
 
+_NAME_SEPARATORS = str.maketrans(dict.fromkeys("、，,;；", " "))
+_FULLWIDTH_PARENS = str.maketrans("（）", "()")
+_NAME_SUFFIX_RE = re.compile(r"^(.*?)\s*\([^()]*\)\s*$")
+
+
+def split_name_tokens(value: str) -> list[str]:
+    """Split a name cell on list separators and whitespace, dropping empties."""
+    return value.translate(_NAME_SEPARATORS).split()
+
 
 def name_key(value: str) -> str:
     cleaned = value.strip()
     if not cleaned:
         return cleaned
-    cleaned = cleaned.replace("（", "(").replace("）", ")")
-    match = re.match(r"^(.*?)\s*\([^()]*\)\s*$", cleaned)
+    cleaned = cleaned.translate(_FULLWIDTH_PARENS)
+    match = _NAME_SUFFIX_RE.match(cleaned)
     if match:
         return match.group(1).strip()
     return cleaned
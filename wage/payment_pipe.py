@@ -3,8 +3,12 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from decimal import Decimal, InvalidOperation
+from operator import attrgetter
 from typing import Iterable, Mapping
 import re
+import sys
+
+from .io import collect_headers
 
 DATE_HEADERS = ["报销日期", "支付日期", "打款日期", "日期"]
 AMOUNT_HEADERS = ["报销金额", "金额", "支付金额", "实付金额"]
@@ -50,6 +54,11 @@ STATUS_WHITELIST = {
     "审核通过",
 }
 
+# Thousands separators, currency marks and spaces dropped from amounts.
+_AMOUNT_TRANSLATION = str.maketrans(dict.fromkeys(",¥￥元 \u00a0"))
+# Trailing role/affiliation annotation such as "张三(组长)" or "李四（外协）".
+_NAME_SUFFIX_RE = re.compile(r"^(.*?)\s*[\(（][^()（）]+[\)）]\s*$")
+
 WAGE_KEYWORDS = ("工资",)
 PREPAY_KEYWORDS = ("预支", "借支", "预发", "预借", "垫付")
 
@@ -68,6 +77,10 @@ class PaymentItem:
     raw_type: str
 
 
+# Payment items are listed by date, then amount.
+_ITEM_ORDER = attrgetter("date", "amount")
+
+
 @dataclass(frozen=True)
 class PaymentResult:
     paid_items: list[PaymentItem]
@@ -98,25 +111,27 @@ class PaymentResult:
         return sum((item.amount for item in self.prepay_items), Decimal("0"))
 
 
+@dataclass(frozen=True)
+class PaymentIndex:
+    rows: list[Mapping[str, str]]
+    headers: set[str]
+    candidate_positions: list[int]
+    positions_by_name: dict[str, list[int]]
+    name_logs: list[tuple[int, str]]
+    project_values: set[str]
+
+
 def _find_header(headers: set[str], candidates: list[str]) -> str | None:
     for candidate in candidates:
         if candidate in headers:
-            return candidate
+            # CSV rows from wage.io carry interned keys; returning the interned
+            # candidate lets per-row lookups match keys by identity.
+            return sys.intern(candidate)
     return None
 
 
 def _clean_amount_text(value: str) -> str:
-    cleaned = (
-        (value or "")
-        .replace(",", "")
-        .replace("¥", "")
-        .replace("￥", "")
-        .replace("元", "")
-        .replace(" ", "")
-        .replace("\u00a0", "")
-        .strip()
-    )
-    return cleaned
+    return (value or "").translate(_AMOUNT_TRANSLATION).strip()
 
 
 def _parse_amount(value: str) -> tuple[Decimal | None, bool]:
@@ -192,7 +207,7 @@ def _normalize_person_name(value: str) -> str:
     cleaned = value.strip()
     if not cleaned:
         return cleaned
-    match = re.match(r"^(.*?)\s*[\(（][^()（）]+[\)）]\s*$", cleaned)
+    match = _NAME_SUFFIX_RE.match(cleaned)
     if match:
         return match.group(1).strip()
     return cleaned
@@ -221,14 +236,77 @@ def _missing_type_evidence(
     )
 
 
+def build_payment_index(payment_rows: Iterable[Mapping[str, str]]) -> PaymentIndex:
+    """Scan payment rows once and group payment candidates by normalized name."""
+    rows = list(payment_rows)
+    headers = collect_headers(rows)
+    candidate_positions: list[int] = []
+    positions_by_name: dict[str, list[int]] = {}
+    name_logs: list[tuple[int, str]] = []
+    project_values: set[str] = set()
+    index = PaymentIndex(
+        rows=rows,
+        headers=headers,
+        candidate_positions=candidate_positions,
+        positions_by_name=positions_by_name,
+        name_logs=name_logs,
+        project_values=project_values,
+    )
+    required_keys = [
+        _find_header(headers, DATE_HEADERS),
+        _find_header(headers, AMOUNT_HEADERS),
+        _find_header(headers, STATUS_HEADERS),
+        _find_header(headers, TYPE_HEADERS),
+    ]
+    name_key = _find_header(headers, NAME_HEADERS)
+    if None in required_keys or name_key is None:
+        return index
+    project_key = _find_header(headers, PROJECT_HEADERS)
+    attendance_work_key = _find_attendance_work_header(headers)
+    attendance_date_key = _find_header(headers, ATTENDANCE_DATE_HEADERS)
+    attendance_name_key = _find_header(headers, ATTENDANCE_NAME_HEADERS)
+
+    for position, row in enumerate(rows):
+        if _is_attendance_row(
+            row,
+            attendance_work_key,
+            attendance_date_key,
+            attendance_name_key,
+        ):
+            continue
+        if not is_payment_candidate(row):
+            continue
+        project_value = row.get(project_key, "").strip() if project_key else ""
+        if project_value:
+            project_values.add(project_value)
+        raw_name_value = row.get(name_key, "").strip()
+        name_value = _normalize_person_name(raw_name_value)
+        if raw_name_value and name_value != raw_name_value:
+            name_logs.append(
+                (position, f"姓名规范化: '{raw_name_value}' -> '{name_value}'")
+            )
+        candidate_positions.append(position)
+        if name_value:
+            positions_by_name.setdefault(name_value, []).append(position)
+    return index
+
+
 def compute_payments(
     payment_rows: Iterable[Mapping[str, str]],
     project_name: str | None,
     target_person: str | None,
     source_name: str | None = None,
+    index: PaymentIndex | None = None,
 ) -> PaymentResult:
-    rows = list(payment_rows)
-    headers = {key.strip() for row in rows for key in row.keys()}
+    """Compute wage payments for ``target_person``.
+
+    ``index`` may be a prebuilt :func:`build_payment_index` for the same rows; it
+    lets callers settle many people without rescanning rows.
+    """
+    if index is None:
+        index = build_payment_index(payment_rows)
+    rows = index.rows
+    headers = index.headers
     date_key = _find_header(headers, DATE_HEADERS)
     amount_key = _find_header(headers, AMOUNT_HEADERS)
     status_key = _find_header(headers, STATUS_HEADERS)
@@ -238,9 +316,6 @@ def compute_payments(
     project_key = _find_header(headers, PROJECT_HEADERS)
     voucher_key = _find_header(headers, VOUCHER_HEADERS)
     remark_key = _find_header(headers, REMARK_HEADERS)
-    attendance_work_key = _find_attendance_work_header(headers)
-    attendance_date_key = _find_header(headers, ATTENDANCE_DATE_HEADERS)
-    attendance_name_key = _find_header(headers, ATTENDANCE_NAME_HEADERS)
 
     missing_fields = []
     for key, label in (
@@ -257,7 +332,6 @@ def compute_payments(
     missing_amount_candidates: list[str] = []
     missing_type_candidates: list[str] = []
     project_mismatches: list[str] = []
-    project_values: set[str] = set()
     normalization_logs: list[str] = []
     voucher_seen: set[tuple[str, str, Decimal]] = set()
     voucher_duplicates: list[str] = []
@@ -274,49 +348,32 @@ def compute_payments(
     approved_result_items: list[PaymentItem] = []
     rejected_result_items: list[PaymentItem] = []
 
-    normalized_target = _normalize_person_name(target_person or "")
-    for index, row in enumerate(rows, start=1):
-        if _is_attendance_row(
-            row,
-            attendance_work_key,
-            attendance_date_key,
-            attendance_name_key,
-        ):
-            continue
-        if None in (date_key, amount_key, status_key, type_key, name_key):
+    if target_person:
+        normalized_target = _normalize_person_name(target_person)
+        positions = index.positions_by_name.get(normalized_target, [])
+    else:
+        positions = index.candidate_positions
+    name_logs = iter(index.name_logs)
+    pending_log = next(name_logs, None)
+    for position in positions:
+        while pending_log is not None and pending_log[0] <= position:
+            normalization_logs.append(pending_log[1])
+            pending_log = next(name_logs, None)
+        line_no = position + 1
+        row = rows[position]
+        # Filter on the type first so non-wage rows cost a single lookup.
+        type_value = row.get(type_key, "").strip()
+        if type_value and "工资" not in type_value:
             continue
-        date_value = _normalize_date(row.get(date_key, ""))
         amount_raw = row.get(amount_key, "")
-        status_value = row.get(status_key, "").strip()
-        result_value = row.get(result_key, "").strip() if result_key else ""
-        type_value = row.get(type_key, "").strip()
-        raw_name_value = row.get(name_key, "").strip()
-        name_value = _normalize_person_name(raw_name_value)
-        project_value = row.get(project_key, "").strip() if project_key else ""
         voucher_value = row.get(voucher_key, "").strip() if voucher_key else ""
         remark_value = row.get(remark_key, "").strip() if remark_key else ""
 
-        if not is_payment_candidate(row):
-            continue
-
-        if project_value:
-            project_values.add(project_value)
-
-        if raw_name_value and name_value != raw_name_value:
-            normalization_logs.append(
-                f"姓名规范化: '{raw_name_value}' -> '{name_value}'"
-            )
-
-        if target_person and name_value and name_value != normalized_target:
-            continue
-
-        if target_person and not name_value:
-            continue
         if not type_value:
             missing_type_candidates.append(
                 _missing_type_evidence(
                     source_name=source_name,
-                    line_no=index,
+                    line_no=line_no,
                     raw_type=type_value,
                     amount_raw=amount_raw,
                     voucher_value=voucher_value,
@@ -324,16 +381,21 @@ def compute_payments(
                 )
             )
             continue
-        if "工资" not in type_value:
-            continue
+
+        date_value = _normalize_date(row.get(date_key, ""))
+        status_value = row.get(status_key, "").strip()
+        result_value = row.get(result_key, "").strip() if result_key else ""
+        raw_name_value = row.get(name_key, "").strip()
+        name_value = _normalize_person_name(raw_name_value)
+        project_value = row.get(project_key, "").strip() if project_key else ""
 
         amount, invalid_amount = _parse_amount(amount_raw)
         if amount is None:
             if invalid_amount:
-                invalid_amounts.append(f"第{index}行 金额='{amount_raw}'")
+                invalid_amounts.append(f"第{line_no}行 金额='{amount_raw}'")
             else:
                 missing_amount_candidates.append(
-                    f"第{index}行 疑似支付行但金额缺失: {amount_key}='{amount_raw}'"
+                    f"第{line_no}行 疑似支付行但金额缺失: {amount_key}='{amount_raw}'"
                 )
             continue
 
@@ -346,7 +408,7 @@ def compute_payments(
 
         category = _categorize(type_value)
         item = PaymentItem(
-            line_no=index,
+            line_no=line_no,
             date=date_value,
             name=raw_name_value or name_value,
             project=project_value,
@@ -397,15 +459,22 @@ def compute_payments(
         else:
             pending_items.append(item)
 
-    paid_items.sort(key=lambda item: (item.date, item.amount))
-    prepay_items.sort(key=lambda item: (item.date, item.amount))
-    project_expense_items.sort(key=lambda item: (item.date, item.amount))
-    road_allowance_items.sort(key=lambda item: (item.date, item.amount))
-    pending_items.sort(key=lambda item: (item.date, item.amount))
-    missing_status_items.sort(key=lambda item: (item.date, item.amount))
-    invalid_status_items.sort(key=lambda item: (item.date, item.amount))
-    approved_result_items.sort(key=lambda item: (item.date, item.amount))
-    rejected_result_items.sort(key=lambda item: (item.date, item.amount))
+    if pending_log is not None:
+        normalization_logs.append(pending_log[1])
+        normalization_logs.extend(log for _, log in name_logs)
+
+    for items in (
+        paid_items,
+        prepay_items,
+        project_expense_items,
+        road_allowance_items,
+        pending_items,
+        missing_status_items,
+        invalid_status_items,
+        approved_result_items,
+        rejected_result_items,
+    ):
+        items.sort(key=_ITEM_ORDER)
 
     return PaymentResult(
         paid_items=paid_items,
@@ -422,7 +491,7 @@ def compute_payments(
         missing_amount_candidates=missing_amount_candidates,
         missing_type_candidates=missing_type_candidates,
         project_mismatches=project_mismatches,
-        project_candidates=sorted(project_values),
+        project_candidates=sorted(index.project_values),
         voucher_duplicates=voucher_duplicates,
         empty_voucher_duplicates=empty_voucher_duplicates,
         normalization_logs=normalization_logs,
@@ -434,7 +503,7 @@ def collect_payment_people(
     project_name: str | None,
 ) -> set[str]:
     rows = list(payment_rows)
-    headers = {key.strip() for row in rows for key in row.keys()}
+    headers = collect_headers(rows)
     name_key = _find_header(headers, NAME_HEADERS)
     project_key = _find_header(headers, PROJECT_HEADERS)
     type_key = _find_header(headers, TYPE_HEADERS)
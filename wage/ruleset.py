@@ -4,6 +4,8 @@ from __future__ import annotations
 from pathlib import Path
 import re
 
+_VERSION_RE = re.compile(r"版本\s+(v[^\s]+)")
+
 
 def get_ruleset_version() -> str:
     repo_root = Path(__file__).resolve().parents[1]
@@ -17,7 +19,7 @@ def get_ruleset_version() -> str:
     if not latest_md.exists():
         raise FileNotFoundError("ruleset version file not found")
     for line in latest_md.read_text(encoding="utf-8").splitlines():
-        match = re.search(r"版本\s+(v[^\s]+)", line)
+        match = _VERSION_RE.search(line)
         if match:
             return match.group(1)
     raise ValueError("ruleset version not found in latest ruleset file")
@@ -3,26 +3,37 @@ from __future__ import annotations
 
 import hashlib
 import json
+import os
 import uuid
 from dataclasses import dataclass
 from decimal import Decimal
 from pathlib import Path
-from typing import Iterable, Mapping
+from typing import Any, Iterable, Mapping
 
 from .attendance_pipe import (
+    AttendanceIndex,
     AttendanceResult,
+    build_attendance_index,
     collect_name_key_conflicts,
     compute_attendance,
 )
 from .checks import CheckResult, run_checks
 from .name_utils import name_key, normalize_name_map
-from .payment_pipe import PaymentResult, compute_payments
+from .payment_pipe import (
+    PaymentIndex,
+    PaymentResult,
+    build_payment_index,
+    compute_payments,
+)
 from .render_blocking_report import render_blocking_report
 from .ruleset import get_ruleset_version
 
 RULE_VERSION = get_ruleset_version()
 VERSION_NOTE = f"计算口径版本 {RULE_VERSION}｜阻断模式：Hard"
 OUTPUT_HASH_PLACEHOLDER = "__OUTPUT_HASH__"
+PARALLEL_MIN_SPECS = 8
+# Run logs go here, relative to the working directory.
+LOG_DIR = Path("logs")
 
 DAILY_WAGE_MAP = {
     "王怀宇": Decimal("300"),
@@ -48,6 +59,17 @@ class SettlementOutput:
     compressed: str
 
 
+@dataclass(frozen=True)
+class SettleResult:
+    """A settlement report plus the facts callers would otherwise parse back out."""
+
+    output_text: str
+    blocked: bool
+    pending_summary: dict[str, int]
+    blocking_codes: list[str]
+    log_path: Path
+
+
 @dataclass(frozen=True)
 class PricingResult:
     wage_group: Decimal
@@ -61,9 +83,70 @@ class PricingResult:
     payable: Decimal
 
 
+@dataclass(frozen=True)
+class PreparedInputs:
+    attendance_rows: list[Mapping[str, str]]
+    payment_rows: list[Mapping[str, str]]
+    project_name: str | None
+    attendance_index: AttendanceIndex
+    payment_index: PaymentIndex
+    name_key_conflicts: list[dict[str, object]]
+    encoded_attendance_rows: bytes
+    encoded_payment_rows: bytes
+
+
+def prepare_inputs(
+    attendance_rows: Iterable[Mapping[str, str]],
+    payment_rows: Iterable[Mapping[str, str]],
+    *,
+    project_name: str | None,
+    attendance_index: AttendanceIndex | None = None,
+    payment_index: PaymentIndex | None = None,
+) -> PreparedInputs:
+    """Run the person-independent scans of a settlement once."""
+    attendance_list = list(attendance_rows)
+    payment_list = list(payment_rows)
+    if attendance_index is None:
+        attendance_index = build_attendance_index(attendance_list, project_name)
+    if payment_index is None:
+        payment_index = build_payment_index(payment_list)
+    return PreparedInputs(
+        attendance_rows=attendance_list,
+        payment_rows=payment_list,
+        project_name=project_name,
+        attendance_index=attendance_index,
+        payment_index=payment_index,
+        name_key_conflicts=collect_name_key_conflicts(attendance_list, project_name),
+        encoded_attendance_rows=_encode_payload(attendance_list),
+        encoded_payment_rows=_encode_payload(payment_list),
+    )
+
+
+def _encode_payload(payload: object) -> bytes:
+    # Rows may be any read-only Mapping (e.g. MappingProxyType); encode them as dicts.
+    return json.dumps(
+        payload, ensure_ascii=False, sort_keys=True, default=dict
+    ).encode("utf-8")
+
+
 def _hash_payload(payload: object) -> str:
-    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
-    return hashlib.sha256(encoded).hexdigest()
+    return hashlib.sha256(_encode_payload(payload)).hexdigest()
+
+
+def _hash_input(prepared: PreparedInputs, command: dict[str, object]) -> str:
+    """Hash ``{"attendance_rows", "command", "payment_rows"}`` like _hash_payload.
+
+    The rows are encoded once per :class:`PreparedInputs`; only the command is
+    encoded per person. Keys are fed in sorted order so the digest matches.
+    """
+    digest = hashlib.sha256(b'{"attendance_rows": ')
+    digest.update(prepared.encoded_attendance_rows)
+    digest.update(b', "command": ')
+    digest.update(_encode_payload(command))
+    digest.update(b', "payment_rows": ')
+    digest.update(prepared.encoded_payment_rows)
+    digest.update(b"}")
+    return digest.hexdigest()
 
 
 def _format_decimal(value: Decimal) -> str:
@@ -250,9 +333,8 @@ def _serialize_payment_items(items: list[object]) -> list[dict[str, str]]:
 
 
 def _write_log(log_filename: str, payload: dict) -> None:
-    log_dir = Path("logs")
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_path = log_dir / log_filename
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    log_path = LOG_DIR / log_filename
     log_path.write_text(
         json.dumps(payload, ensure_ascii=False, sort_keys=True, indent=2),
         encoding="utf-8",
@@ -362,22 +444,174 @@ def settle_person(
     role: str | None,
     project_ended: bool | None,
     project_name: str | None,
-    runtime_overrides: dict | None = None,
+    runtime_overrides: Mapping[str, Any] | None = None,
+    attendance_index: AttendanceIndex | None = None,
+    payment_index: PaymentIndex | None = None,
 ) -> str:
-    """Return the settlement report (two segments) or blocking report."""
-    runtime_overrides = runtime_overrides or {}
+    """Return the settlement report (two segments) or blocking report.
+
+    ``attendance_index``/``payment_index`` are optional prebuilt row indexes for
+    the same rows, shared when settling several people from one table.
+    """
+    prepared = prepare_inputs(
+        attendance_rows,
+        payment_rows,
+        project_name=project_name,
+        attendance_index=attendance_index,
+        payment_index=payment_index,
+    )
+    return _settle_prepared(
+        prepared,
+        person_name=person_name,
+        role=role,
+        project_ended=project_ended,
+        runtime_overrides=runtime_overrides,
+    ).output_text
+
+
+def settle_people(
+    attendance_rows: Iterable[Mapping[str, str]],
+    payment_rows: Iterable[Mapping[str, str]],
+    specs: Iterable[Mapping[str, Any]],
+    *,
+    max_workers: int | None = 1,
+    attendance_index: AttendanceIndex | None = None,
+) -> list[str]:
+    """Settle several people from the same tables, sharing row scans.
+
+    Each spec holds the keyword arguments of :func:`settle_person`
+    (``person_name``, ``role``, ``project_ended``, ``project_name`` and
+    optionally ``runtime_overrides``). Reports are returned in spec order.
+
+    With ``max_workers`` above 1 (``None`` means one per CPU) and at least
+    ``PARALLEL_MIN_SPECS`` specs, people are settled in worker processes that
+    each receive the rows once at start-up.
+
+    ``attendance_index`` may be a prebuilt :func:`build_attendance_index` of
+    the same rows; it is used for the specs of its project.
+    """
+    results = settle_people_results(
+        attendance_rows,
+        payment_rows,
+        specs,
+        max_workers=max_workers,
+        attendance_index=attendance_index,
+    )
+    return [result.output_text for result in results]
+
+
+def settle_people_results(
+    attendance_rows: Iterable[Mapping[str, str]],
+    payment_rows: Iterable[Mapping[str, str]],
+    specs: Iterable[Mapping[str, Any]],
+    *,
+    max_workers: int | None = 1,
+    attendance_index: AttendanceIndex | None = None,
+) -> list[SettleResult]:
+    """Like :func:`settle_people`, returning a :class:`SettleResult` per spec."""
     attendance_list = list(attendance_rows)
     payment_list = list(payment_rows)
-    attendance_name_conflicts = collect_name_key_conflicts(
-        attendance_list, project_name
-    )
+    spec_list = list(specs)
+    workers = max_workers if max_workers is not None else os.cpu_count() or 1
+    if workers > 1 and len(spec_list) >= PARALLEL_MIN_SPECS:
+        # Imported here: multiprocessing is only needed for parallel batches
+        # and noticeably slows down importing this module.
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(spec_list)),
+            initializer=_init_settle_worker,
+            initargs=(
+                [dict(row) for row in attendance_list],
+                [dict(row) for row in payment_list],
+                attendance_index,
+            ),
+        ) as executor:
+            return list(executor.map(_settle_spec_in_worker, spec_list))
+
+    batch = _SettleBatch(attendance_list, payment_list, attendance_index)
+    return [batch.settle(spec) for spec in spec_list]
+
+
+class _SettleBatch:
+    """Settles specs against one pair of tables, preparing each project once."""
+
+    def __init__(
+        self,
+        attendance_rows: list[Mapping[str, str]],
+        payment_rows: list[Mapping[str, str]],
+        attendance_index: AttendanceIndex | None = None,
+    ) -> None:
+        self.attendance_rows = attendance_rows
+        self.payment_rows = payment_rows
+        self.attendance_index = attendance_index
+        self.payment_index = build_payment_index(payment_rows)
+        self.prepared_by_project: dict[str | None, PreparedInputs] = {}
+
+    def settle(self, spec: Mapping[str, Any]) -> SettleResult:
+        project_name = spec.get("project_name")
+        prepared = self.prepared_by_project.get(project_name)
+        if prepared is None:
+            attendance_index = self.attendance_index
+            if attendance_index is not None:
+                if attendance_index.project_name != project_name:
+                    attendance_index = None
+            prepared = prepare_inputs(
+                self.attendance_rows,
+                self.payment_rows,
+                project_name=project_name,
+                attendance_index=attendance_index,
+                payment_index=self.payment_index,
+            )
+            self.prepared_by_project[project_name] = prepared
+        return _settle_prepared(
+            prepared,
+            person_name=spec.get("person_name"),
+            role=spec.get("role"),
+            project_ended=spec.get("project_ended"),
+            runtime_overrides=spec.get("runtime_overrides"),
+        )
+
+
+_WORKER_BATCH: _SettleBatch | None = None
+
+
+def _init_settle_worker(
+    attendance_rows: list[Mapping[str, str]],
+    payment_rows: list[Mapping[str, str]],
+    attendance_index: AttendanceIndex | None = None,
+) -> None:
+    global _WORKER_BATCH
+    _WORKER_BATCH = _SettleBatch(attendance_rows, payment_rows, attendance_index)
 
-    attendance = compute_attendance(attendance_list, project_name, person_name)
+
+def _settle_spec_in_worker(spec: Mapping[str, Any]) -> SettleResult:
+    assert _WORKER_BATCH is not None
+    return _WORKER_BATCH.settle(spec)
+
+
+def _settle_prepared(
+    prepared: PreparedInputs,
+    *,
+    person_name: str | None,
+    role: str | None,
+    project_ended: bool | None,
+    runtime_overrides: Mapping[str, Any] | None,
+) -> SettleResult:
+    runtime_overrides = runtime_overrides or {}
+    project_name = prepared.project_name
+    attendance_list = prepared.attendance_rows
+    payment_list = prepared.payment_rows
+
+    attendance = compute_attendance(
+        attendance_list, project_name, person_name, prepared.attendance_index
+    )
     payment = compute_payments(
         payment_list,
         project_name,
         person_name,
         runtime_overrides.get("payment_source"),
+        prepared.payment_index,
     )
     project_name_source = runtime_overrides.get("project_name_source")
     if project_name and not project_name_source:
@@ -440,23 +674,20 @@ def settle_person(
         road_cmd,
     )
 
-    input_hash = _hash_payload(
+    input_hash = _hash_input(
+        prepared,
         {
-            "command": {
-                "person_name": person_name,
-                "role": role,
-                "project_ended": project_ended,
-                "project_name": project_name,
-            },
-            "attendance_rows": attendance_list,
-            "payment_rows": payment_list,
-        }
+            "person_name": person_name,
+            "role": role,
+            "project_ended": project_ended,
+            "project_name": project_name,
+        },
     )
     run_id = _generate_run_id()
     log_filename = _build_log_filename(run_id, input_hash)
 
     name_key_conflicts = list(runtime_overrides.get("name_key_conflicts") or [])
-    name_key_conflicts.extend(attendance_name_conflicts)
+    name_key_conflicts.extend(prepared.name_key_conflicts)
     context = {
         "attendance": attendance,
         "payment": payment,
@@ -559,7 +790,13 @@ def settle_person(
             "suggestions": suggestions,
         }
         _write_log(log_filename, log_payload)
-        return output_text
+        return SettleResult(
+            output_text=output_text,
+            blocked=True,
+            pending_summary={},
+            blocking_codes=[check.code for check in hard_failures],
+            log_path=LOG_DIR / log_filename,
+        )
 
     auto_logs = (
         attendance.auto_corrections
@@ -857,4 +1094,10 @@ def settle_person(
     }
     _write_log(log_filename, log_payload)
 
-    return output_text
+    return SettleResult(
+        output_text=output_text,
+        blocked=False,
+        pending_summary=pending_reasons,
+        blocking_codes=[],
+        log_path=LOG_DIR / log_filename,
+    )